@@ -1,13 +1,23 @@
-import csv
 import os
 import random
 
+import astro_config
+import storage
+from train_builder import TrainSetWriter
+
 SRC_FILES = [
-    "/storage/emulated/0/astrollm/dataset/astronomy.csv",
-    "/storage/emulated/0/astrollm/dataset/asteroids.csv"
+    astro_config.dataset_path("astronomy.csv", "astronomy_csv"),
+    astro_config.dataset_path("asteroids.csv", "asteroids_csv"),
 ]
 
-OUT_FILE = "/storage/emulated/0/astrollm/dataset/train.csv"
+OUT_FILE = astro_config.dataset_path("train.csv", "train_csv")
+
+# ---- TEKİLLEŞTİRME / DENGELEME / AYRIM ----
+SEED = 42                   # şablon seçimi tekrarlanabilir
+DEDUP = "set"               # "set" | "bloom" (sabit bellek, çok büyük kaynaklar) | None
+MAX_PER_INTENT = None       # intent başına satır sınırı (ör. 200_000)
+BALANCE = True              # her intent en küçük intent'in boyuna örneklenir
+VAL_RATIO = 0.1             # hash tabanlı validation oranı → train.val.csv
 
 TEMPLATES = [
     "{} nedir",
@@ -29,34 +39,35 @@ def clean(text):
     return t
 
 def main():
-    os.makedirs(os.path.dirname(OUT_FILE), exist_ok=True)
+    rng = random.Random(SEED)
 
     total = 0
-    with open(OUT_FILE, "w", newline="", encoding="utf-8") as out:
-        writer = csv.writer(out)
-        writer.writerow(["text", "intent"])
-
+    with TrainSetWriter(OUT_FILE, val_ratio=VAL_RATIO, dedup=DEDUP,
+                        max_per_intent=MAX_PER_INTENT, balance=BALANCE) as writer:
         for src in SRC_FILES:
-            if not os.path.exists(src):
+            resolved = storage.resolve(src)
+            if resolved is None:
+                print("⚠️ Kaynak yok:", src)
                 continue
 
             intent = os.path.basename(src).replace(".csv", "")
 
-            with open(src, encoding="utf-8") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    for cell in row:
-                        base = clean(cell)
-                        if not base:
-                            continue
+            for row in storage.iter_rows(resolved):
+                for cell in row:
+                    base = clean(cell)
+                    if not base:
+                        continue
 
-                        q = random.choice(TEMPLATES).format(base)
-                        writer.writerow([q, intent])
-                        total += 1
+                    q = rng.choice(TEMPLATES).format(base)
+                    writer.add(q, intent)
+                    total += 1
 
     print("✅ train.csv üretildi")
-    print("📊 Toplam satır:", total)
+    print("📥 Aday satır:", total)
+    print(writer.summary())
     print("📄 Yol:", OUT_FILE)
+    if VAL_RATIO > 0:
+        print("📄 Validation:", writer.val_path)
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,12 @@
-import csv
 import os
 import random
 
-BASE_DIR = "/storage/emulated/0/astrollm/dataset"
-OUT_FILE = os.path.join(BASE_DIR, "train.csv")
+import astro_config
+from train_builder import TrainSetWriter
 
-os.makedirs(BASE_DIR, exist_ok=True)
+OUT_FILE = astro_config.dataset_path("train.csv", "train_csv")
+
+os.makedirs(os.path.dirname(OUT_FILE), exist_ok=True)
 
 intents = [
     "asteroid_risk",
@@ -44,18 +45,19 @@ questions = {
     ],
 }
 
-rows = []
-
-# 5000+ satır üret
-for _ in range(900):
-    for intent, qs in questions.items():
-        q = random.choice(qs)
-        rows.append([q, intent])
+# Tekrarlı satırlar eğitime bir şey katmaz → hash ile elenir.
+# Soru sayısı az olduğundan validation ayrımı kapalı.
+ROUNDS = 900
+DEDUP = "set"               # None → eski davranış (tüm tekrarlar yazılır)
+VAL_RATIO = 0.0
+BALANCE = False             # soru havuzları elle dengeli; 2 soruya indirmeye gerek yok
 
-with open(OUT_FILE, "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["text", "intent"])
-    writer.writerows(rows)
+# Satırlar bellekte biriktirilmeden akış halinde yazılır
+# (.gz / .zst uzantısı → sıkıştırılmış)
+with TrainSetWriter(OUT_FILE, val_ratio=VAL_RATIO, dedup=DEDUP, balance=BALANCE) as writer:
+    for _ in range(ROUNDS):
+        for intent, qs in questions.items():
+            writer.add(random.choice(qs), intent)
 
 print(f"✅ train.csv oluşturuldu → {OUT_FILE}")
-print(f"📊 Toplam satır: {len(rows)}")
\ No newline at end of file
+print(writer.summary())
\ No newline at end of file
@@ -0,0 +1,260 @@
+# ============================================================
+# asteroid_store.py – COLUMNAR ASTEROID STATE
+# NumPy sütunları | Vektörel sorgular | dict uyumlu kayıtlar
+# Sabit bellekli risk geçmişi (RiskHistory)
+# ============================================================
+
+from collections import deque
+
+import numpy as np
+
+
+class AsteroidRecord:
+    """
+    Tek asteroid için hafif görünüm (kopya yok).
+    Eski dict erişimi korunur: a["risk"], a.get("vector"), "vector" in a
+    """
+
+    __slots__ = ("batch", "i")
+
+    def __init__(self, batch, i):
+        self.batch = batch
+        self.i = i
+
+    def __getitem__(self, key):
+        if key not in AsteroidBatch.FIELDS:
+            raise KeyError(key)
+        return self.batch.value(key, self.i)
+
+    def get(self, key, default=None):
+        if key not in AsteroidBatch.FIELDS:
+            return default
+        return self.batch.value(key, self.i)
+
+    def __contains__(self, key):
+        return key in AsteroidBatch.FIELDS
+
+    def keys(self):
+        return AsteroidBatch.FIELDS.keys()
+
+    def to_dict(self):
+        return {k: self[k] for k in self.keys()}
+
+    def __repr__(self):
+        return f"AsteroidRecord({self.to_dict()})"
+
+
+class AsteroidBatch:
+    """
+    Bir tick'teki tüm asteroidler, sütun bazlı.
+
+    Sütunlar: id, name, profile, source (str), risk, speed_ra,
+    speed_dec, time_distance (sayısal), vector (n x 3)
+    """
+
+    # alan adı → sütun niteliği
+    FIELDS = {
+        "id": "ids",
+        "name": "names",
+        "risk": "risk",
+        "speed_ra": "speed_ra",
+        "speed_dec": "speed_dec",
+        "profile": "profiles",
+        "source": "sources",
+        "vector": "vectors",
+        "time_distance": "time_distance",
+    }
+
+    __slots__ = tuple(FIELDS.values())
+
+    def __init__(self, ids, names, risk, speed_ra, speed_dec,
+                 vectors, time_distance, profiles=None, sources=None):
+        n = len(names)
+        self.ids = np.asarray(ids, dtype=str)
+        self.names = np.asarray(names, dtype=str)
+        self.risk = np.asarray(risk, dtype=np.int32)
+        self.speed_ra = np.asarray(speed_ra, dtype=np.float32)
+        self.speed_dec = np.asarray(speed_dec, dtype=np.float32)
+        self.vectors = (
+            np.asarray(vectors, dtype=np.float32).reshape(n, -1)
+            if n else np.zeros((0, 3), dtype=np.float32)
+        )
+        self.time_distance = np.broadcast_to(
+            np.asarray(time_distance, dtype=np.int32), (n,)
+        )
+        self.profiles = np.asarray(profiles if profiles is not None else [""] * n, dtype=str)
+        self.sources = np.asarray(sources if sources is not None else [""] * n, dtype=str)
+
+    @classmethod
+    def from_dicts(cls, asteroids):
+        asteroids = list(asteroids)
+        return cls(
+            ids=[a.get("id", "") for a in asteroids],
+            names=[a["name"] for a in asteroids],
+            risk=[a.get("risk", 0) for a in asteroids],
+            speed_ra=[a.get("speed_ra", 0.0) for a in asteroids],
+            speed_dec=[a.get("speed_dec", 0.0) for a in asteroids],
+            vectors=[a.get("vector", (0.0, 0.0, 0.0)) for a in asteroids],
+            time_distance=[a.get("time_distance", 0) for a in asteroids],
+            profiles=[a.get("profile", "") for a in asteroids],
+            sources=[a.get("source", "") for a in asteroids],
+        )
+
+    # --------------------------------------------------------
+    # ERİŞİM
+    # --------------------------------------------------------
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return (AsteroidRecord(self, i) for i in range(len(self)))
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return AsteroidRecord(self, i)
+
+    def value(self, key, i):
+        col = getattr(self, self.FIELDS[key])
+        if key == "vector":
+            return col[i].tolist()
+        return col[i].item()
+
+    def to_dicts(self):
+        return [r.to_dict() for r in self]
+
+    def risk_by_name(self):
+        # Kompakt geçmiş için {isim: risk}
+        return dict(zip(self.names.tolist(), self.risk.tolist()))
+
+    def take(self, idx):
+        """Index dizisine göre alt küme (yeni batch)"""
+        idx = np.asarray(idx, dtype=np.int64)
+        return AsteroidBatch(
+            self.ids[idx], self.names[idx], self.risk[idx],
+            self.speed_ra[idx], self.speed_dec[idx], self.vectors[idx],
+            self.time_distance[idx], self.profiles[idx], self.sources[idx],
+        )
+
+    # --------------------------------------------------------
+    # VEKTÖREL SORGULAR
+    # --------------------------------------------------------
+    def argmax_risk(self):
+        if not len(self):
+            return None
+        return int(np.argmax(self.risk))
+
+    def most_risky(self):
+        i = self.argmax_risk()
+        return None if i is None else AsteroidRecord(self, i)
+
+    def top_risky(self, k=5):
+        """Riske göre azalan ilk k asteroid"""
+        k = min(k, len(self))
+        if k <= 0:
+            return self.take([])
+        idx = np.argpartition(-self.risk, k - 1)[:k]
+        idx = idx[np.argsort(-self.risk[idx], kind="stable")]
+        return self.take(idx)
+
+    def above(self, threshold):
+        """risk >= threshold olan asteroidler"""
+        return self.take(np.flatnonzero(self.risk >= threshold))
+
+
+# ============================================================
+# RISK HISTORY (ring buffer + çok çözünürlüklü özet)
+# ============================================================
+
+class RiskHistory:
+    """
+    Son `recent` tick ham tutulur; daha eski geçmiş her seviyede
+    `bucket` tick'lik (min, max, mean) kovalar olarak saklanır.
+    Bellek sabittir: recent + seviye sayısı x buckets.
+
+    len(history) toplam tick sayısıdır (time_distance için).
+    """
+
+    def __init__(self, recent=1024, levels=(10, 100, 1000), buckets=512):
+        self.total = 0
+        self.recent = deque(maxlen=recent)
+        self.levels = [
+            {"size": size, "buckets": deque(maxlen=buckets), "acc": None}
+            for size in levels
+        ]
+
+    def __len__(self):
+        return self.total
+
+    def append(self, value):
+        t = self.total
+        self.recent.append(value)
+        self.total += 1
+
+        for level in self.levels:
+            acc = level["acc"]
+            if acc is None:
+                acc = level["acc"] = [t, value, value, 0, 0]
+            acc[1] = min(acc[1], value)
+            acc[2] = max(acc[2], value)
+            acc[3] += value
+            acc[4] += 1
+
+            if acc[4] == level["size"]:
+                level["buckets"].append((acc[0], acc[1], acc[2], acc[3] / acc[4]))
+                level["acc"] = None
+
+    def last(self, n):
+        """Son n ham değer (n <= recent)"""
+        n = min(n, len(self.recent))
+        return list(self.recent)[len(self.recent) - n:] if n else []
+
+    def query(self, last_n, max_points=20):
+        """
+        Son last_n tick için en fazla max_points nokta:
+        [(başlangıç tick, min, max, mean), ...]
+        Ham veri yetiyorsa ham, yoksa en ince uygun seviye kullanılır.
+        En kaba seviye bile fazla nokta veriyorsa komşu kovalar birleştirilir.
+        """
+        last_n = min(last_n, self.total)
+        start = self.total - last_n
+
+        if last_n <= max_points and last_n <= len(self.recent):
+            return [(start + i, v, v, v) for i, v in enumerate(self.last(last_n))]
+
+        for level in self.levels:
+            if -(-last_n // level["size"]) <= max_points:
+                return self._merge_points(self._level_points(level, start), max_points)
+
+        return self._merge_points(self._level_points(self.levels[-1], start), max_points)
+
+    def _merge_points(self, points, max_points):
+        """Ardışık kovaları gruplayarak nokta sayısını max_points'e indirir"""
+        if len(points) <= max_points or max_points <= 0:
+            return points
+
+        # Kova başına tick sayısı: sonraki kovanın başlangıcına (veya sona) kadar
+        ends = [p[0] for p in points[1:]] + [self.total]
+        counts = [end - p[0] for p, end in zip(points, ends)]
+
+        group = -(-len(points) // max_points)
+        merged = []
+        for i in range(0, len(points), group):
+            chunk, weights = points[i:i + group], counts[i:i + group]
+            merged.append((
+                chunk[0][0],
+                min(p[1] for p in chunk),
+                max(p[2] for p in chunk),
+                sum(p[3] * w for p, w in zip(chunk, weights)) / max(sum(weights), 1),
+            ))
+        return merged
+
+    @staticmethod
+    def _level_points(level, start):
+        points = [b for b in level["buckets"] if b[0] + level["size"] > start]
+        acc = level["acc"]
+        if acc is not None:
+            points.append((acc[0], acc[1], acc[2], acc[3] / acc[4]))
+        return points
@@ -0,0 +1,91 @@
+# ============================================================
+# astro_config.py – ORTAK YAPILANDIRMA
+# Öncelik: CLI bayrağı > ortam değişkeni > config dosyası > varsayılan
+# ============================================================
+#
+#   python astrollm.py --dataset-dir /mnt/fast/astrollm
+#   ASTROLLM_DATASET_DIR=/dev/shm/astrollm python intent_model.py
+#   astrollm.json → {"dataset_dir": "/data/astrollm", "train_csv": "train.csv.gz"}
+#
+# Anahtar "x_y" için: bayrak --x-y, ortam değişkeni ASTROLLM_X_Y
+# ============================================================
+
+import json
+import os
+import sys
+
+DEFAULT_DATASET_DIR = "/storage/emulated/0/astrollm/dataset"
+
+ENV_PREFIX = "ASTROLLM_"
+CONFIG_ENV = "ASTROLLM_CONFIG"
+CONFIG_FILES = (
+    "astrollm.json",
+    os.path.expanduser("~/.config/astrollm/config.json"),
+)
+
+_file_config = None
+
+
+def _cli_value(flag, argv=None):
+    """--bayrak değer  veya  --bayrak=değer"""
+    argv = sys.argv[1:] if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == flag and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(flag + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def config_path():
+    """Kullanılan config dosyası (yoksa None)"""
+    path = _cli_value("--config") or os.environ.get(CONFIG_ENV)
+    if path:
+        return path
+    for candidate in CONFIG_FILES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def file_config():
+    global _file_config
+    if _file_config is None:
+        path = config_path()
+        _file_config = {}
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    _file_config = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Config okunamadı ({path}):", e)
+    return _file_config
+
+
+def get(key, default=None, cast=None):
+    flag = "--" + key.replace("_", "-")
+    env = ENV_PREFIX + key.upper()
+
+    for value in (_cli_value(flag), os.environ.get(env), file_config().get(key)):
+        if value is not None:
+            return cast(value) if cast else value
+    return default
+
+
+def dataset_dir():
+    return os.path.expanduser(get("dataset_dir", DEFAULT_DATASET_DIR))
+
+
+def dataset_path(name, key=None):
+    """
+    Veri dizinindeki dosya. key verilirse (ör. "train_csv") o anahtarla
+    ayrı bir yol/isim yapılandırılabilir; göreli değer veri dizinine göredir.
+    """
+    value = get(key) if key else None
+    return os.path.join(dataset_dir(), os.path.expanduser(value or name))
+
+
+def describe():
+    """Etkin yapılandırmanın tek satırlık özeti"""
+    source = config_path()
+    return f"veri dizini: {dataset_dir()}" + (f" | config: {source}" if source else "")
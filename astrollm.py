@@ -17,13 +17,17 @@ GOSHAWK_LOGO = r"""
   Corporate Astro Intelligence Engine
 """
 import sys
-import time
 import random
 from datetime import datetime
 
+import numpy as np
+
 # ✅ SADECE AstroLLM import edilir
 from astrollmmodule import AstroLLM
+import astro_config
 from tiny_transformer import TinyTransformer
+from asteroid_store import AsteroidBatch, RiskHistory
+from live_engine import LiveSimulation, MetricsSink
 
 # ============================================================
 # SAFE INPUT
@@ -61,33 +65,42 @@ ASTEROID_PROFILES = [
     {"name": "Toutatis", "risk": 55},
 ]
 
-RISK_HISTORY = []
+# Son tick'ler ham, eski geçmiş min/max/mean kovaları (sabit bellek)
+RISK_HISTORY = RiskHistory()
+
+# Tick başına simüle edilen nesne sayısı (min, max)
+ASTEROID_COUNT = (2, 4)
 
+PROFILE_NAMES = np.array([p["name"] for p in ASTEROID_PROFILES])
+PROFILE_RISKS = np.array([p["risk"] for p in ASTEROID_PROFILES])
 
-def generate_asteroids():
-    asteroids = []
+RNG = np.random.default_rng()
 
-    for i in range(random.randint(2, 4)):
-        base = random.choice(ASTEROID_PROFILES)
-        risk = max(5, min(95, base["risk"] + random.randint(-10, 10)))
 
-        asteroid = {
-            "id": f"NEO-{2025+i}",
-            "name": f"AST-{1000+i}",
-            "risk": risk,
-            "speed_ra": random.uniform(0.1, 1.2),
-            "speed_dec": random.uniform(0.01, 0.12),
-            "profile": base["name"],
-            "source": "SIMULATED",
+def generate_asteroids(history=RISK_HISTORY, rng=RNG):
+    """Tüm tick tek seferde, sütun bazlı üretilir (AsteroidBatch)."""
+    n = int(rng.integers(ASTEROID_COUNT[0], ASTEROID_COUNT[1] + 1))
+    idx = np.arange(n)
 
-            # 🧠 AstroLLM içinde kullanılacak
-            "vector": [risk / 100, base["risk"] / 100, 1.0],
-            "time_distance": len(RISK_HISTORY)
-        }
+    base = rng.integers(len(ASTEROID_PROFILES), size=n)
+    base_risk = PROFILE_RISKS[base]
+    risk = np.clip(base_risk + rng.integers(-10, 11, size=n), 5, 95)
 
-        asteroids.append(asteroid)
+    asteroids = AsteroidBatch(
+        ids=np.char.add("NEO-", (2025 + idx).astype(str)),
+        names=np.char.add("AST-", (1000 + idx).astype(str)),
+        risk=risk,
+        speed_ra=rng.uniform(0.1, 1.2, size=n),
+        speed_dec=rng.uniform(0.01, 0.12, size=n),
+        profiles=PROFILE_NAMES[base],
+        sources=np.full(n, "SIMULATED"),
 
-    RISK_HISTORY.append(max(a["risk"] for a in asteroids))
+        # 🧠 AstroLLM içinde kullanılacak
+        vectors=np.column_stack([risk / 100, base_risk / 100, np.ones(n)]),
+        time_distance=len(history),
+    )
+
+    history.append(int(risk.max()))
     return asteroids
 
 # ============================================================
@@ -97,15 +110,21 @@ def generate_asteroids():
 def help_menu():
     print("""
 Komutlar:
- canli        → Canlı simülasyon
+ canli        → Canlı simülasyon (arka planda)
+ canli dur    → Canlı simülasyonu durdur
+ canli sessiz → Canlı çıktıyı aç / kapat
+ canli hiz <sn> → Tick aralığı (0 = olabildiğince hızlı)
+ bench [n]    → n tick performans ölçümü
  harita       → 2D çarpışma görseli
- grafik       → Risk zaman grafiği
+ grafik [n]   → Risk zaman grafiği (son n tick, özetli)
  neden        → Risk nedenleri
  benzer       → Hangi asteroidlere benziyor
  gercek       → Veri gerçeklik analizi
  tahmin       → 6 saatlik senaryo
  rapor        → Bilimsel metin
+ beam         → Radio Beam sıralaması
  sor <soru>   → AstroLLM soru-cevap
+ intent       → Intent kademe istatistikleri (kural / MLP)
  yardim       → Yardım menüsü
  cikis        → Çıkış
 """)
@@ -114,25 +133,74 @@ Komutlar:
 # LIVE MODE
 # ============================================================
 
-def live_mode():
-    print("Canlı analiz başladı (CTRL+C ile çık)\n")
+LIVE_INTERVAL = 3.0
 
-    try:
-        while True:
-            asteroids = generate_asteroids()
-            LLM.update_live_data(asteroids)
 
-            print("Canlı Analiz:")
+def simulation_tick():
+    asteroids = generate_asteroids()
+    LLM.update_live_data(asteroids)
+    return asteroids
+
+
+def print_tick(tick, asteroids):
+    print("\nCanlı Analiz:")
+
+    for a in asteroids:
+        yorum = TT.generate_live_comment(a["name"])
+        print(f"{a['name']} | RİSK {a['risk']} → {yorum}")
 
-            for a in asteroids:
-                yorum = TT.generate_live_comment(a["name"])
-                print(f"{a['name']} | RİSK {a['risk']} → {yorum}")
+    print("-" * 45)
 
-            print("-" * 45)
-            time.sleep(3)
 
-    except KeyboardInterrupt:
-        print("\nCanlı analiz durduruldu\n")
+ENGINE = LiveSimulation(simulation_tick, interval=LIVE_INTERVAL)
+METRICS = ENGINE.subscribe(MetricsSink())
+ENGINE.subscribe(print_tick)
+
+
+def live_mode(arg=""):
+    """Simülasyon arka planda döner; REPL komutları çalışmaya devam eder."""
+    if arg == "dur":
+        ENGINE.stop()
+        print(f"Canlı analiz durduruldu | {ENGINE.stats()['ticks']} tick\n")
+    elif arg == "sessiz":
+        if print_tick in ENGINE.subscribers:
+            ENGINE.unsubscribe(print_tick)
+            print("Canlı çıktı kapatıldı")
+        else:
+            ENGINE.subscribe(print_tick)
+            print("Canlı çıktı açıldı")
+    elif arg.startswith("hiz"):
+        try:
+            ENGINE.interval = float(arg[3:].strip())
+            print(f"Tick aralığı: {ENGINE.interval} sn")
+        except ValueError:
+            print("Kullanım: canli hiz <saniye>")
+    elif ENGINE.running:
+        print(f"Canlı analiz zaten çalışıyor | {METRICS.ticks_per_sec():.2f} tick/sn")
+    else:
+        ENGINE.start()
+        print("Canlı analiz başladı ('canli dur' ile durdur)\n")
+
+
+def bench_mode(arg=""):
+    n = int(arg) if arg.isdigit() else 100
+
+    # Çıktısız, beklemesiz ayrı motor. Tick'ler aynı işi yapar ama atılacak
+    # geçmiş / bağlam / MiniLLM / RNG üzerinde: RISK_HISTORY, canlı bağlam ve
+    # trend geçmişi bench'ten etkilenmez
+    history, rng = RiskHistory(), np.random.default_rng()
+    context, mini = type(LLM.context)(), type(LLM.mini)()
+
+    def bench_tick():
+        asteroids = generate_asteroids(history, rng)
+        context.update(asteroids)
+        mini.observe(asteroids)
+        return asteroids
+
+    stats = LiveSimulation(bench_tick, interval=0).run(n)
+
+    print(f"\n{stats['ticks']} tick | {stats['ticks_per_sec']} tick/sn | "
+          f"{stats['busy_per_tick_ms']} ms/tick\n")
 
 # ============================================================
 # 2D MAP
@@ -157,11 +225,24 @@ def harita_mode():
 # GRAPH
 # ============================================================
 
-def grafik_mode():
+def grafik_mode(arg=""):
     print("\nRisk Zaman Grafiği:\n")
-    for i, r in enumerate(RISK_HISTORY[-10:]):
-        bar = "#" * (r // 5)
-        print(f"T+{i:02d} | {bar} {r}")
+
+    if not arg.isdigit():
+        for i, r in enumerate(RISK_HISTORY.last(10)):
+            bar = "#" * (r // 5)
+            print(f"T+{i:02d} | {bar} {r}")
+        print("")
+        return
+
+    # Uzun aralıklar kova özetleriyle gösterilir: ortalama [min-max]
+    n = min(int(arg), len(RISK_HISTORY))
+    points = RISK_HISTORY.query(n)
+    for t0, lo, hi, mean in points:
+        bar = "#" * int(mean // 5)
+        print(f"T{t0:>6} | {bar} {mean:.0f} [{lo}-{hi}]")
+    if points and points[0][0] > len(RISK_HISTORY) - n:
+        print(f"(geçmiş T{points[0][0]}'dan itibaren tutuluyor, daha eskisi yok)")
     print("")
 
 # ============================================================
@@ -235,44 +316,96 @@ def rapor_mode():
     print(TT.generate_report(a["name"], a["risk"]))
     print("Model: AstroLLM + TinyTransformer\n")
 
+# ============================================================
+# RADIO BEAM
+# ============================================================
+
+def beam_mode(top_k=5):
+    ranked = LLM.radio_beam_batch(top_k=top_k)
+    if not ranked:
+        print("Veri yok.")
+        return
+
+    print("\nRadio Beam Sıralaması:\n")
+    for a, score in ranked:
+        print(f"{a['name']} | RİSK {a['risk']} | 📡 {score}")
+    print("")
+
+# ============================================================
+# INTENT ROUTER İSTATİSTİKLERİ
+# ============================================================
+
+def intent_mode():
+    router = LLM.qa.intent_model
+    if not hasattr(router, "stats"):
+        print("Intent router yok")
+        return
+
+    print("\n🧭 INTENT KADEMELERİ")
+    for tier, s in router.stats().items():
+        extra = "" if "loaded" not in s else f" | model {'yüklü' if s['loaded'] else 'yüklenmedi'}"
+        print(
+            f"{tier:7s} | çağrı {s['calls']:5d} | isabet %{100 * s['hit_rate']:5.1f}"
+            f" | ort {s['avg_ms']:.3f} ms{extra}"
+        )
+    print()
+
 # ============================================================
 # MAIN LOOP
 # ============================================================
 
+def dispatch(cmd):
+    if cmd == "harita":
+        harita_mode()
+    elif cmd == "grafik" or cmd.startswith("grafik "):
+        grafik_mode(cmd[7:].strip())
+    elif cmd == "neden":
+        neden_mode()
+    elif cmd == "benzer":
+        benzer_mode()
+    elif cmd == "gercek":
+        gercek_mode()
+    elif cmd == "tahmin":
+        tahmin_mode()
+    elif cmd == "rapor":
+        rapor_mode()
+    elif cmd == "beam":
+        beam_mode()
+    elif cmd.startswith("sor "):
+        print("LLM:", LLM.ask(cmd[4:]))
+    elif cmd == "intent":
+        intent_mode()
+    elif cmd == "yardim":
+        help_menu()
+    else:
+        print("Bilinmeyen komut")
+
+
 def main():
     print(GOSHAWK_LOGO)
     print("AstroLLM – Professional Analysis Engine Prototype")
-    print("© Goshawk Vortex.AI\n")
+    print("© Goshawk Vortex.AI")
+    print(f"📁 {astro_config.describe()}\n")
     help_menu()
 
     while True:
         cmd = safe_input("> ")
 
-        if cmd == "canli":
-            live_mode()
-        elif cmd == "harita":
-            harita_mode()
-        elif cmd == "grafik":
-            grafik_mode()
-        elif cmd == "neden":
-            neden_mode()
-        elif cmd == "benzer":
-            benzer_mode()
-        elif cmd == "gercek":
-            gercek_mode()
-        elif cmd == "tahmin":
-            tahmin_mode()
-        elif cmd == "rapor":
-            rapor_mode()
-        elif cmd.startswith("sor "):
-            print("LLM:", LLM.ask(cmd[4:]))
-        elif cmd == "yardim":
-            help_menu()
-        elif cmd == "cikis":
+        # Motoru yöneten komutlar kilit dışında çalışır (stop → join)
+        if cmd == "canli" or cmd.startswith("canli "):
+            live_mode(cmd[6:].strip())
+            continue
+        if cmd == "bench" or cmd.startswith("bench "):
+            bench_mode(cmd[6:].strip())
+            continue
+        if cmd == "cikis":
+            ENGINE.stop()
             print("Çıkılıyor")
             break
-        else:
-            print("Bilinmeyen komut")
+
+        # Canlı tick ile aynı anda durum okunmasın
+        with ENGINE.lock:
+            dispatch(cmd)
 
 # ============================================================
 # ENTRY
@@ -14,48 +14,76 @@ GOSHAWK_LOGO = r"""
 """
 
 import os
+import re
 import csv
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
 
+import astro_config
 from mini_attention import MiniAttention
+from text_rewriter import TextRewriter, keyword_regex
+
+try:
+    from near_dup import NearDuplicateFilter
+except Exception:
+    NearDuplicateFilter = None
+
+try:
+    import numpy as np
+except Exception:
+    np = None
 
 # ============================================================
 # TEXT POST-PROCESSING (DEDUP + PARAPHRASE)
 # ============================================================
 
+# Kurallar bir kez derlenir, metin tek geçişte dönüştürülür
+NORMALIZE_RULES = {
+    ",": "",
+    ".": "",
+    "potansiyel": "",
+    "oluşturmaktadır": "",
+}
+
+PARAPHRASE_RULES = {
+    "potansiyel tehdit oluşturmaktadır": "risk faktörü olarak değerlendirilmektedir",
+    "analizlerde": "incelemelerde",
+    "sebebiyle": "nedeniyle",
+    "bu durum": "bu etki",
+    "oluşturmaktadır": "göstermektedir"
+}
+
+NORMALIZER = TextRewriter(NORMALIZE_RULES)
+PARAPHRASER = TextRewriter(PARAPHRASE_RULES)
+
+
 def normalize_sentence(s: str) -> str:
-    return (
-        s.lower()
-        .replace(",", "")
-        .replace(".", "")
-        .replace("potansiyel", "")
-        .replace("oluşturmaktadır", "")
-        .strip()
-    )
+    return NORMALIZER(s.lower()).strip()
 
 
-def deduplicate_sentences(sentences):
+def deduplicate_sentences(sentences, threshold=None):
+    """
+    threshold verilirse (0–1) birebir aynı olmayan ama SimHash
+    benzerliği eşiğin üstündeki cümleler de elenir.
+    """
     seen = set()
+    # Birkaç cümle: dar bantlarla kesin mod (kova boyu burada sorun değil)
+    near = NearDuplicateFilter(threshold, band_bits=4) if threshold and NearDuplicateFilter else None
     result = []
     for s in sentences:
         key = normalize_sentence(s)
-        if key not in seen:
-            seen.add(key)
-            result.append(s)
+        if key in seen:
+            continue
+        seen.add(key)
+        if near is not None and near.seen(key):
+            continue
+        result.append(s)
     return result
 
 
 def simple_paraphrase(sentence: str) -> str:
-    replacements = {
-        "potansiyel tehdit oluşturmaktadır": "risk faktörü olarak değerlendirilmektedir",
-        "analizlerde": "incelemelerde",
-        "sebebiyle": "nedeniyle",
-        "bu durum": "bu etki",
-        "oluşturmaktadır": "göstermektedir"
-    }
-    for k, v in replacements.items():
-        sentence = sentence.replace(k, v)
-    return sentence
+    return PARAPHRASER(sentence)
 
 
 # ============================================================
@@ -77,14 +105,64 @@ try:
 except Exception:
     RadioBeamModel = None
 
+try:
+    from asteroid_store import AsteroidBatch
+except Exception:
+    AsteroidBatch = None
+
+try:
+    # Aynı sınıf adı, farklı model: eğitilmiş MLP (intent_model.py)
+    from intent_model import AdvancedIntentModel as NeuralIntentModel
+except Exception:
+    NeuralIntentModel = None
+
 
 # ============================================================
 # DATA PATHS
 # ============================================================
 
-DATASET_DIR = "/storage/emulated/0/astrollm/dataset"
-ASTRONOMY_CSV = f"{DATASET_DIR}/astronomy.csv"
-ASTEROIDS_CSV = f"{DATASET_DIR}/asteroids.csv"
+# Kök dizin: --dataset-dir / ASTROLLM_DATASET_DIR / astrollm.json
+# (bkz. astro_config.py). .csv yoksa .csv.gz / .csv.zst denenir.
+DATASET_DIR = astro_config.dataset_dir()
+ASTRONOMY_CSV = astro_config.dataset_path("astronomy.csv", "astronomy_csv")
+ASTEROIDS_CSV = astro_config.dataset_path("asteroids.csv", "asteroids_csv")
+KB_SNAPSHOT = astro_config.dataset_path("kb.snapshot", "kb_snapshot")
+
+# KB kaynakları: dosya listesi veya dizin (içindeki tüm *.csv).
+# Dosyalar ayrı süreçlerde paralel yüklenir, sırayla birleştirilir.
+KB_SOURCES = [ASTRONOMY_CSV, ASTEROIDS_CSV]
+KB_WORKERS = None             # None = CPU sayısı
+
+# Ek paraphrase kuralları (satır: kaynak => hedef), varsa yüklenir
+PARAPHRASE_RULES_FILE = astro_config.dataset_path("paraphrase_rules.txt", "paraphrase_rules")
+
+# Ek intent anahtar kelimeleri (satır: intent => kelime1, kelime2), varsa yüklenir
+INTENT_KEYWORDS_FILE = astro_config.dataset_path("intent_keywords.txt", "intent_keywords")
+
+# Hibrit intent yönlendirme: kural eşleşmezse eğitilmiş MLP (tembel yüklenir)
+# Eşik: --neural-intent-threshold / ASTROLLM_NEURAL_INTENT_THRESHOLD / astrollm.json
+INTENT_MODEL_PATH = astro_config.dataset_path("intent_model.npz", "intent_model")
+NEURAL_INTENT_THRESHOLD = astro_config.get("neural_intent_threshold", 0.6, float)
+
+# MLP intent'leri → cevap motorunun intent'leri (eşlenmeyenler aynen geçer)
+NEURAL_INTENT_MAP = {
+    "asteroid_risk": "asteroid",
+    "asteroid_near": "asteroid",
+    "asteroid_size": "asteroid",
+    "planet_size": "planet",
+}
+
+# KB sıralaması: "count" (eşleşen kelime sayısı), "bm25" veya "legacy"
+# (indeks yerine eski tam alt-dize taraması)
+KB_RANKING = "count"
+
+# SimHash yakın kopya eşikleri (0–1, None = kapalı)
+KB_NEAR_DUP = None            # KB yüklenirken korpusu küçültür
+ANSWER_NEAR_DUP = 0.9         # cevapta aynı cümlenin varyasyonlarını eler
+
+# Akışlı KB yükleme (büyük CSV'ler / küçük bellekli cihazlar)
+KB_STREAMING = False
+KB_MEMORY_BUDGET_MB = None    # None = sınırsız
 
 
 # ============================================================
@@ -95,37 +173,221 @@ class AstroContext:
     def __init__(self):
         self.asteroids = []
         self.last_update = None
+        # Her canlı veri güncellemesinde artar (cache versiyonlama)
+        self.generation = 0
 
     def update(self, asteroids):
-        self.asteroids = asteroids or []
+        # dict listeleri sütun bazlı AsteroidBatch'e çevrilir (varsa)
+        if AsteroidBatch and not isinstance(asteroids, AsteroidBatch):
+            asteroids = AsteroidBatch.from_dicts(asteroids or [])
+        self.asteroids = asteroids if asteroids is not None else []
         self.last_update = datetime.utcnow()
+        self.generation += 1
 
     def most_risky(self):
-        if not self.asteroids:
+        if not len(self.asteroids):
             return None
+        if AsteroidBatch and isinstance(self.asteroids, AsteroidBatch):
+            return self.asteroids.most_risky()
         return max(self.asteroids, key=lambda a: a.get("risk", 0))
 
+    def top_risky(self, k=5):
+        if AsteroidBatch and isinstance(self.asteroids, AsteroidBatch):
+            return list(self.asteroids.top_risky(k))
+        return sorted(self.asteroids, key=lambda a: a.get("risk", 0), reverse=True)[:k]
+
 
 # ============================================================
 # INTENT MODEL
 # ============================================================
 
+# Öncelik sırasıyla (üstteki kural kazanır)
+INTENT_RULES = [
+    ("asteroid", ("asteroid", "göktaşı", "neo", "çarpma")),
+    ("planet", ("mars", "gezegen", "jüpiter", "satürn")),
+    ("star", ("güneş", "yıldız", "süpernova")),
+    ("galaxy", ("galaksi", "samanyolu")),
+    ("how_it_works", ("nasıl",)),
+    ("is_real", ("gerçek",)),
+]
+
+
 class AdvancedIntentModel:
+    """
+    Tüm kuralların kelimeleri tek bir trie regex'ine derlenir ve metin tek
+    geçişte taranır; bulunan kelimelerin intent'lerinden en yüksek
+    öncelikli olan kazanır (eski "sırayla any(...)" zinciri ile aynı sonuç).
+    Kelime listesi binlerce terime (asteroid adları, katalog isimleri)
+    büyüse de sorgu maliyeti metin uzunluğuna bağlıdır.
+    """
+
+    def __init__(self, rules=INTENT_RULES):
+        self.keywords = {}
+        self._pattern = None
+        self._priority = None
+        self._dirty = False
+        for intent, words in rules:
+            self.add_keywords(intent, words)
+
+    def add_keywords(self, intent, words):
+        """
+        Mevcut intent'e kelime ekler; yeni intent en düşük önceliği alır.
+        Derleme ilk predict'e ertelenir (toplu eklemede tek derleme).
+        """
+        bucket = self.keywords.setdefault(intent, set())
+        bucket.update(w.lower().strip() for w in words if w.strip())
+        self._dirty = True
+
+    def _compile(self):
+        rank = {}
+        for i, intent in enumerate(self.keywords):
+            for word in self.keywords[intent]:
+                rank.setdefault(word, i)
+
+        # Bir konumda trie regex en uzun kelimeyi yakalar; aynı konumdan
+        # başlayan daha kısa kelimeler onun önekleridir → önceliklerini devral
+        self._priority = {
+            word: min(rank[word[:n]] for n in range(1, len(word) + 1) if word[:n] in rank)
+            for word in rank
+        }
+
+        # (?=(...)): örtüşen eşleşmeler de görülür (her başlangıç konumu)
+        rx = keyword_regex(sorted(rank))
+        self._pattern = re.compile("(?=(" + rx.pattern + "))") if rx else None
+        self._intents = list(self.keywords)
+        self._dirty = False
+
+    def load_file(self, path):
+        """
+        Satır formatı:  intent => kelime1, kelime2, ...
+        '#' ile başlayan satırlar yorumdur.
+        """
+        collected = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+                if "=>" not in line:
+                    raise ValueError(f"Geçersiz kelime satırı: {line!r}")
+                intent, words = line.split("=>", 1)
+                collected.setdefault(intent.strip(), []).extend(words.split(","))
+
+        for intent, words in collected.items():
+            self.add_keywords(intent, words)
+        return self
+
     def predict(self, text: str) -> str:
-        t = text.lower()
-        if any(w in t for w in ("asteroid", "göktaşı", "neo", "çarpma")):
-            return "asteroid"
-        if any(w in t for w in ("mars", "gezegen", "jüpiter", "satürn")):
-            return "planet"
-        if any(w in t for w in ("güneş", "yıldız", "süpernova")):
-            return "star"
-        if any(w in t for w in ("galaksi", "samanyolu")):
-            return "galaxy"
-        if "nasıl" in t:
-            return "how_it_works"
-        if "gerçek" in t:
-            return "is_real"
-        return "unknown"
+        if self._dirty or self._priority is None:
+            self._compile()
+        if self._pattern is None:
+            return "unknown"
+
+        best = None
+        priority = self._priority
+        for m in self._pattern.finditer(text.lower()):
+            p = priority[m.group(1)]
+            if best is None or p < best:
+                best = p
+                if best == 0:
+                    break
+        return "unknown" if best is None else self._intents[best]
+
+
+# ============================================================
+# INTENT ROUTER (KURAL → MLP KADEMESİ)
+# ============================================================
+
+class IntentRouter:
+    """
+    1. kademe: anahtar kelime kuralları (µs mertebesi); eşleşirse biter
+    2. kademe: eğitilmiş MLP, sadece kalan sorular için; model dosyası
+       ilk ihtiyaçta yüklenir. Güven < neural_threshold → "unknown"
+
+    Kademe başına çağrı, isabet oranı ve gecikme tutulur (stats()).
+    """
+
+    TIERS = ("rule", "neural")
+
+    def __init__(self, rule_model=None, model_path=INTENT_MODEL_PATH,
+                 neural_threshold=NEURAL_INTENT_THRESHOLD, intent_map=None):
+        self.rule_model = rule_model or AdvancedIntentModel()
+        self.model_path = model_path
+        self.neural_threshold = neural_threshold
+        self.intent_map = NEURAL_INTENT_MAP if intent_map is None else intent_map
+
+        self._neural = None
+        self._neural_failed = False
+        self.counters = {t: {"calls": 0, "hits": 0, "seconds": 0.0} for t in self.TIERS}
+        self.last_route = None
+
+    @property
+    def neural_model(self):
+        """
+        MLP (tembel); dosya / numpy yoksa None ve bir daha denenmez.
+        Dondurulmamış (fit_vocabulary'siz) model reddedilir: vocab / IDF
+        her soruda kayar ve tahminler tekrarlanamaz olur.
+        """
+        if self._neural is None and not self._neural_failed:
+            if NeuralIntentModel is None or not self.model_path or not os.path.exists(self.model_path):
+                self._neural_failed = True
+            else:
+                try:
+                    model = NeuralIntentModel.load(self.model_path)
+                except Exception as e:
+                    print("⚠️ Intent modeli yüklenemedi:", e)
+                    self._neural_failed = True
+                else:
+                    if getattr(model, "frozen", False):
+                        self._neural = model
+                    else:
+                        print("⚠️ Intent modeli dondurulmamış (vocab sabit değil), MLP kademesi kapalı")
+                        self._neural_failed = True
+        return self._neural
+
+    def _count(self, tier, hit, t0):
+        c = self.counters[tier]
+        c["calls"] += 1
+        c["hits"] += hit
+        c["seconds"] += time.perf_counter() - t0
+
+    def route(self, text):
+        """(intent, kademe, güven); hiçbir kademe emin değilse kademe None"""
+        t0 = time.perf_counter()
+        intent = self.rule_model.predict(text)
+        hit = intent != "unknown"
+        self._count("rule", hit, t0)
+        if hit:
+            return intent, "rule", 1.0
+
+        model = self.neural_model
+        if model is None:
+            return "unknown", None, 0.0
+
+        t0 = time.perf_counter()
+        intent, conf = model.predict(text)
+        hit = intent != "unknown" and conf >= self.neural_threshold
+        self._count("neural", hit, t0)
+        if hit:
+            return self.intent_map.get(intent, intent), "neural", conf
+        return "unknown", None, conf
+
+    def predict(self, text: str) -> str:
+        intent, tier, conf = self.route(text)
+        self.last_route = (tier, conf)
+        return intent
+
+    def stats(self):
+        out = {}
+        for tier, c in self.counters.items():
+            calls = c["calls"]
+            out[tier] = {
+                "calls": calls,
+                "hits": c["hits"],
+                "hit_rate": round(c["hits"] / calls, 3) if calls else 0.0,
+                "avg_ms": round(1000 * c["seconds"] / calls, 4) if calls else 0.0,
+            }
+        out["neural"]["loaded"] = self._neural is not None
+        return out
 
 
 # ============================================================
@@ -133,13 +395,39 @@ class AdvancedIntentModel:
 # ============================================================
 
 class MiniLLM:
-    def __init__(self):
-        self.history = []
+    """
+    history : son `window` tick'in {isim: risk} özetleri (ring buffer)
+    series  : isim → (tick, risk) ring buffer; çok adımlı trend için
+    """
+
+    def __init__(self, window=50, ewma_alpha=0.3):
+        self.window = window
+        self.ewma_alpha = ewma_alpha
+        self.history = deque(maxlen=window)
+        self.series = {}
+        self.tick = 0
 
     def observe(self, asteroids):
-        if asteroids:
-            self.history.append(asteroids)
-            self.history = self.history[-50:]
+        if asteroids is None or not len(asteroids):
+            return
+
+        self.tick += 1
+        if hasattr(asteroids, "risk_by_name"):
+            snapshot = asteroids.risk_by_name()
+        else:
+            snapshot = {a["name"]: a["risk"] for a in asteroids}
+        self.history.append(snapshot)
+
+        for name, risk in snapshot.items():
+            series = self.series.get(name)
+            if series is None:
+                series = self.series[name] = deque(maxlen=self.window)
+            series.append((self.tick, risk))
+
+        # Pencereden tamamen düşen nesneler bırakılır
+        oldest = self.tick - self.window
+        for name in [n for n, s in self.series.items() if s[-1][0] <= oldest]:
+            del self.series[name]
 
     def risk_trend(self):
         if len(self.history) < 2:
@@ -148,11 +436,11 @@ class MiniLLM:
         last = self.history[-1]
         prev = self.history[-2]
 
-        inc = 0
-        for a in last:
-            for b in prev:
-                if a["name"] == b["name"] and a["risk"] > b["risk"]:
-                    inc += 1
+        # İsim üzerinden O(n) birleştirme
+        inc = sum(
+            1 for name, risk in last.items()
+            if name in prev and risk > prev[name]
+        )
 
         if inc > len(last) // 2:
             return "artan risk"
@@ -160,6 +448,42 @@ class MiniLLM:
             return "stabil"
         return "dalgalı"
 
+    def risk_stats(self, name):
+        """
+        Pencere boyunca tek nesnenin risk serisi:
+        slope (tick başına eğim), ewma, volatility (adım farklarının std'si)
+        """
+        series = self.series.get(name)
+        if not series:
+            return None
+
+        ticks = [t for t, _ in series]
+        risks = [r for _, r in series]
+        n = len(risks)
+
+        ewma = risks[0]
+        for r in risks[1:]:
+            ewma = self.ewma_alpha * r + (1 - self.ewma_alpha) * ewma
+
+        slope = 0.0
+        volatility = 0.0
+        if n > 1:
+            mt = sum(ticks) / n
+            mr = sum(risks) / n
+            var_t = sum((t - mt) ** 2 for t in ticks)
+            slope = sum((t - mt) * (r - mr) for t, r in zip(ticks, risks)) / var_t
+
+            diffs = [b - a for a, b in zip(risks, risks[1:])]
+            md = sum(diffs) / len(diffs)
+            volatility = (sum((d - md) ** 2 for d in diffs) / len(diffs)) ** 0.5
+
+        return {
+            "samples": n,
+            "slope": round(slope, 3),
+            "ewma": round(ewma, 2),
+            "volatility": round(volatility, 3),
+        }
+
     def report(self, asteroid):
         return (
             "Bilimsel Değerlendirme\n"
@@ -176,17 +500,38 @@ class MiniLLM:
 # ============================================================
 
 class AstroQAEngine:
-    def __init__(self, context):
+    def __init__(self, context, kb_ranking=KB_RANKING, kb_near_dup=KB_NEAR_DUP,
+                 answer_near_dup=ANSWER_NEAR_DUP, kb_streaming=KB_STREAMING,
+                 kb_memory_budget_mb=KB_MEMORY_BUDGET_MB, kb_sources=KB_SOURCES,
+                 kb_workers=KB_WORKERS):
         self.context = context
-        self.intent_model = AdvancedIntentModel()
-        self.kb = KnowledgeBase() if KnowledgeBase else None
+        self.intent_model = IntentRouter()
+        self.answer_near_dup = answer_near_dup
+        self.kb = (
+            KnowledgeBase(mode="legacy" if kb_ranking == "legacy" else "index",
+                          ranking="count" if kb_ranking == "legacy" else kb_ranking,
+                          near_dup=kb_near_dup,
+                          streaming=kb_streaming, memory_budget_mb=kb_memory_budget_mb,
+                          workers=kb_workers)
+            if KnowledgeBase else None
+        )
+
+        if os.path.exists(PARAPHRASE_RULES_FILE):
+            PARAPHRASER.load_file(PARAPHRASE_RULES_FILE)
+        if os.path.exists(INTENT_KEYWORDS_FILE):
+            self.intent_model.rule_model.load_file(INTENT_KEYWORDS_FILE)
 
         if self.kb:
-            self.kb.load_file(ASTRONOMY_CSV)
-            self.kb.load_file(ASTEROIDS_CSV)
+            self.kb.load_cached(kb_sources, KB_SNAPSHOT)
+            if not self.kb.documents:
+                # Yanlış veri dizininde sessizce genel cevaba düşmemek için
+                print(f"⚠️ KB boş → {astro_config.describe()}")
+                print("   Ayar: --dataset-dir <dizin> | ASTROLLM_DATASET_DIR | astrollm.json")
 
-    def answer(self, question: str) -> str:
-        intent = self.intent_model.predict(question)
+    def answer(self, question: str, intent=None) -> str:
+        # ask() intent'i zaten hesapladıysa tekrar tahmin edilmez
+        if intent is None:
+            intent = self.intent_model.predict(question)
 
         if intent == "planet":
             return "Gezegenler yıldızlarının etrafında yörüngede döner."
@@ -202,19 +547,106 @@ class AstroQAEngine:
         if self.kb:
             docs = self.kb.search(question)
             if docs:
-                docs = deduplicate_sentences(docs)
+                docs = deduplicate_sentences(docs, self.answer_near_dup)
                 docs = [simple_paraphrase(d) for d in docs]
                 return "Bilgiye göre:\n- " + "\n- ".join(docs)
 
         return "Genel astronomi bilgisi sunulmaktadır."
 
 
+# ============================================================
+# RADIO BEAM DECAY
+# ============================================================
+
+# time_distance → zaman sönümü; skaler veya NumPy dizisiyle çalışır
+BEAM_DECAYS = {
+    "hyperbolic": lambda t: 1 / (1 + t),
+    "exponential": lambda t: 0.5 ** (t / 5),
+    "none": lambda t: t * 0 + 1.0,
+}
+
+
+# ============================================================
+# ANSWER CACHE (LRU + TTL)
+# ============================================================
+
+class AnswerCache:
+    """
+    Sınırlı LRU cache, opsiyonel TTL (saniye).
+
+    generation verilen girişler (canlı asteroid cevapları) sadece
+    aynı context generation'ı için geçerlidir; statik KB cevapları
+    generation=None ile saklanır ve güncellemeden etkilenmez.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidated = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, generation=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, entry_gen = entry
+
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        if entry_gen is not None and entry_gen != generation:
+            del self._data[key]
+            self.invalidated += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, generation=None):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires_at, generation)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+        }
+
+
 # ============================================================
 # MAIN FACADE
 # ============================================================
 
 class AstroLLM:
-    def __init__(self):
+    def __init__(self, cache_size=1024, cache_ttl=None, beam_decay="hyperbolic"):
         self.context = AstroContext()
         self.qa = AstroQAEngine(self.context)
         self.mini = MiniLLM()
@@ -222,11 +654,12 @@ class AstroLLM:
 
         self.attention = MiniAttention()
         self.radio = RadioBeamModel() if RadioBeamModel else None
+        self.beam_decay = beam_decay
 
         # Memory / cache
         self.last_answer = None
         self.answer_history = []
-        self.answer_cache = {}
+        self.answer_cache = AnswerCache(cache_size, cache_ttl)
 
     def update_live_data(self, asteroids):
         self.context.update(asteroids)
@@ -237,26 +670,65 @@ class AstroLLM:
             return self.transformer.generate_live_comment(asteroid["name"])
         return f"{asteroid['name']} → risk {asteroid['risk']}"
 
+    def _decay_fn(self, decay=None):
+        decay = decay or self.beam_decay
+        return decay if callable(decay) else BEAM_DECAYS[decay]
+
     def radio_beam_analysis(self, asteroid):
         if not asteroid or "vector" not in asteroid:
             return None
         semantic = sum(asteroid["vector"]) / len(asteroid["vector"])
-        decay = 1 / (1 + asteroid.get("time_distance", 0))
+        decay = self._decay_fn()(asteroid.get("time_distance", 0))
         return round(max(0.0, semantic * decay - 0.05), 3)
 
+    def radio_beam_batch(self, asteroids=None, decay=None, top_k=None):
+        """
+        Tüm popülasyon için Radio Beam skoru (semantic x decay), tek geçişte.
+        Dönüş: skora göre azalan [(asteroid, skor), ...]
+        """
+        if np is None:
+            raise RuntimeError("radio_beam_batch için numpy gerekli")
+
+        asteroids = self.context.asteroids if asteroids is None else asteroids
+
+        if AsteroidBatch and isinstance(asteroids, AsteroidBatch):
+            items = asteroids
+            semantic = asteroids.vectors.mean(axis=1)
+            distance = asteroids.time_distance.astype(np.float64)
+        else:
+            items = [a for a in asteroids if a and "vector" in a]
+            semantic = np.array([sum(a["vector"]) / len(a["vector"]) for a in items])
+            distance = np.array([a.get("time_distance", 0) for a in items], dtype=np.float64)
+
+        if not len(items):
+            return []
+
+        scores = np.maximum(0.0, semantic * self._decay_fn(decay)(distance) - 0.05).round(3)
+
+        if top_k is not None and top_k < len(scores):
+            if top_k <= 0:
+                return []
+            order = np.argpartition(-scores, top_k - 1)[:top_k]
+            order = order[np.argsort(-scores[order], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+
+        return [(items[int(i)], float(scores[i])) for i in order]
+
     def ask(self, question: str) -> str:
         q = question.lower().strip()
         if not q:
             return "Lütfen geçerli bir soru giriniz."
 
-        if q in self.answer_cache:
-            return self.answer_cache[q]
+        cached = self.answer_cache.get(q, self.context.generation)
+        if cached is not None:
+            return cached
 
         intent = self.qa.intent_model.predict(q)
         live = self.context.most_risky()
 
         if intent != "asteroid":
-            response = self.qa.answer(q)
+            response = self.qa.answer(q, intent)
         elif not live:
             response = "Şu anda canlı asteroid verisi yok."
         else:
@@ -272,7 +744,9 @@ class AstroLLM:
         self.last_answer = response
         self.answer_history.append(response)
         self.answer_history = self.answer_history[-5:]
-        self.answer_cache[q] = response
+        # Canlı cevaplar context generation'ına bağlanır
+        generation = self.context.generation if intent == "asteroid" else None
+        self.answer_cache.put(q, response, generation)
 
         return response
 
@@ -0,0 +1,410 @@
+# ============================================================
+# columnar.py – COMPRESSED COLUMNAR DATASET FORMAT (.acol)
+# Sözlük kodlu kategoriler | Blob + offset metin | Blok sıkıştırma
+# Projeksiyonlu okuma | CSV → .acol dönüştürücü
+# ============================================================
+#
+# Dosya düzeni:
+#   MAGIC | blok 0 sütun chunk'ları | blok 1 ... | footer JSON | u64 footer boyu | MAGIC
+#
+# Footer sonda olduğundan yazım akışlıdır (sabit bellek); okuyucu
+# sadece istenen sütunların chunk'larını açar.
+#
+# Sütun türleri:
+#   int  : int64, delta kodlu (artan id'ler neredeyse sıfıra sıkışır);
+#          sadece her değer str(int(v)) == v ise. Aksi halde ("NEO-1",
+#          "007", "") sütun o bloktan itibaren text olur — önceki int
+#          blokları okurken str'e çevrilir, dönüşüm kayıpsız kalır
+#   dict : sözlük kodu (uint16 / uint32); değerler footer'da
+#   text : UTF-8 blob; metinlerde NUL yoksa NUL ayraçlı (tek decode +
+#          split), varsa blok başına uint32 offset dizisi + blob
+# ============================================================
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+import storage
+
+MAGIC = b"ACOLUMN1"
+VERSION = 1
+SUFFIX = ".acol"
+
+BLOCK_ROWS = 65536
+CODEC = "zlib"              # "zlib" | "zstd" (zstandard gerekir)
+LEVEL = 6
+
+# Başlık ismine göre varsayılan sütun türleri (diğerleri text)
+DICT_COLUMNS = ("topic", "intent")
+INT_COLUMNS = ("id",)
+
+
+def _compressor(codec, level):
+    if codec == "zlib":
+        return lambda data: zlib.compress(data, level)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd için 'zstandard' paketi gerekli")
+        return zstandard.ZstdCompressor(level=level).compress
+    raise ValueError(f"Bilinmeyen codec: {codec}")
+
+
+def _decompressor(codec):
+    if codec == "zlib":
+        return zlib.decompress
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd için 'zstandard' paketi gerekli")
+        return zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Bilinmeyen codec: {codec}")
+
+
+def _int_values(values):
+    """Tüm değerler int'e kayıpsız dönüşüyorsa int listesi, değilse None"""
+    out = []
+    for v in values:
+        if isinstance(v, int) and not isinstance(v, bool):
+            n = v
+        else:
+            text = str(v)
+            try:
+                n = int(text)
+            except ValueError:
+                return None
+            if str(n) != text:
+                return None
+        if not -(1 << 63) <= n < 1 << 63:
+            return None
+        out.append(n)
+    return out
+
+
+def default_kind(name):
+    if name in DICT_COLUMNS:
+        return "dict"
+    if name in INT_COLUMNS:
+        return "int"
+    return "text"
+
+
+# ============================================================
+# WRITER
+# ============================================================
+
+class ColumnarWriter:
+    """
+    Satırları blok blok yazar. Sözlükler yazım boyunca büyür ve
+    footer'a kaydedilir; kodlar ilk görülme sırasıyla verilir.
+
+        with ColumnarWriter(path, ["id", "topic", "text"]) as w:
+            w.write_rows(rows)
+    """
+
+    def __init__(self, path, columns, kinds=None, block_rows=BLOCK_ROWS,
+                 codec=CODEC, level=LEVEL):
+        self.path = path
+        self.columns = list(columns)
+        self.kinds = [
+            (kinds or {}).get(name) or default_kind(name) for name in self.columns
+        ]
+        self.block_rows = block_rows
+        self.codec = codec
+        self._compress = _compressor(codec, level)
+
+        self.dicts = {n: {} for n, k in zip(self.columns, self.kinds) if k == "dict"}
+        self.blocks = []
+        self.rows = 0
+        self._pending = []
+
+        self._tmp = path + ".tmp"
+        self._f = open(self._tmp, "wb")
+        self._f.write(MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()
+            os.remove(self._tmp)
+
+    def write_row(self, row):
+        width = len(self.columns)
+        if len(row) != width:
+            row = (list(row) + [""] * width)[:width]
+        self._pending.append(row)
+        if len(self._pending) >= self.block_rows:
+            self._flush()
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    def _encode(self, name, kind, values):
+        if kind == "int":
+            arr = np.asarray(values, dtype=np.int64)
+            return np.diff(arr, prepend=0).astype("<i8").tobytes(), "<i8"
+
+        if kind == "dict":
+            d = self.dicts[name]
+            codes = [d.setdefault(v, len(d)) for v in values]
+            dtype = "<u2" if len(d) <= 1 << 16 else "<u4"
+            return np.asarray(codes, dtype=dtype).tobytes(), dtype
+
+        texts = [str(v) for v in values]
+        joined = "\0".join(texts)
+        if joined.count("\0") == len(texts) - 1:
+            return joined.encode("utf-8"), "nul"
+
+        encoded = [t.encode("utf-8") for t in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return offsets.tobytes() + b"".join(encoded), "<u4"
+
+    def _flush(self):
+        if not self._pending:
+            return
+
+        n = len(self._pending)
+        block = {"rows": n, "chunks": {}}
+        for i, (name, values) in enumerate(zip(self.columns, zip(*self._pending))):
+            kind = self.kinds[i]
+            if kind == "int":
+                ints = _int_values(values)
+                if ints is None:
+                    # Kayıpsız int değil → sütun bu bloktan itibaren text
+                    kind = self.kinds[i] = "text"
+                else:
+                    values = ints
+            raw, dtype = self._encode(name, kind, values)
+            data = self._compress(raw)
+            block["chunks"][name] = [self._f.tell(), len(data), len(raw), dtype]
+            self._f.write(data)
+
+        self.blocks.append(block)
+        self.rows += n
+        self._pending = []
+
+    def close(self):
+        self._flush()
+        footer = json.dumps({
+            "version": VERSION,
+            "rows": self.rows,
+            "codec": self.codec,
+            "columns": [{"name": n, "kind": k} for n, k in zip(self.columns, self.kinds)],
+            "dicts": {name: list(d) for name, d in self.dicts.items()},
+            "blocks": self.blocks,
+        }, ensure_ascii=False).encode("utf-8")
+
+        self._f.write(footer)
+        self._f.write(struct.pack("<Q", len(footer)))
+        self._f.write(MAGIC)
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+
+# ============================================================
+# READER
+# ============================================================
+
+class ColumnarReader:
+    """
+    columns=None → tüm sütunlar; aksi halde sadece istenenler açılır
+    (ör. ["text"] → topic / id chunk'larına hiç dokunulmaz).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Columnar dosya değil: {path}")
+            f.seek(-(8 + len(MAGIC)), os.SEEK_END)
+            (footer_len,) = struct.unpack("<Q", f.read(8))
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Eksik / yarım columnar dosya: {path}")
+            f.seek(-(8 + len(MAGIC) + footer_len), os.SEEK_END)
+            meta = json.loads(f.read(footer_len))
+
+        if meta.get("version") != VERSION:
+            raise ValueError(f"Desteklenmeyen columnar sürümü: {meta.get('version')}")
+
+        self.rows = meta["rows"]
+        self.codec = meta["codec"]
+        self.columns = [c["name"] for c in meta["columns"]]
+        self.kinds = {c["name"]: c["kind"] for c in meta["columns"]}
+        self.dicts = {
+            name: np.asarray(values, dtype=object) for name, values in meta["dicts"].items()
+        }
+        self.blocks = meta["blocks"]
+        self._decompress = _decompressor(self.codec)
+
+    def __len__(self):
+        return self.rows
+
+    def _columns(self, columns):
+        if columns is None:
+            return list(self.columns)
+        missing = [c for c in columns if c not in self.kinds]
+        if missing:
+            raise KeyError(f"Sütun yok: {missing}")
+        return list(columns)
+
+    def _decode(self, f, name, chunk, n):
+        offset, size, _, dtype = chunk
+        f.seek(offset)
+        raw = self._decompress(f.read(size))
+        kind = self.kinds[name]
+
+        if dtype == "<i8":
+            values = np.cumsum(np.frombuffer(raw, dtype=dtype))
+            # text'e düşmüş sütunun int blokları
+            return values if kind == "int" else [str(v) for v in values.tolist()]
+        if kind == "dict":
+            return self.dicts[name][np.frombuffer(raw, dtype=dtype)]
+
+        if dtype == "nul":
+            return raw.decode("utf-8").split("\0") if n else []
+
+        head = 4 * (n + 1)
+        offsets = np.frombuffer(raw, dtype=dtype, count=n + 1).tolist()
+        blob = raw[head:]
+        return [blob[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def iter_blocks(self, columns=None):
+        """Blok başına {sütun: değerler} (int → ndarray, dict → object ndarray, text → list)"""
+        columns = self._columns(columns)
+        with open(self.path, "rb") as f:
+            for block in self.blocks:
+                yield {
+                    name: self._decode(f, name, block["chunks"][name], block["rows"])
+                    for name in columns
+                }
+
+    def read(self, columns=None):
+        """Tüm dosya: {sütun: list}"""
+        columns = self._columns(columns)
+        out = {name: [] for name in columns}
+        for block in self.iter_blocks(columns):
+            for name in columns:
+                values = block[name]
+                out[name].extend(values.tolist() if isinstance(values, np.ndarray) else values)
+        return out
+
+    def iter_row_blocks(self, columns=None, as_str=False):
+        """
+        Blok başına satır listesi [(hücre, ...), ...]. as_str=True → tüm
+        hücreler str (CSV okuyucularıyla aynı satır tipi).
+        """
+        columns = self._columns(columns)
+        for block in self.iter_blocks(columns):
+            cols = []
+            for name in columns:
+                values = block[name]
+                if isinstance(values, np.ndarray):
+                    values = values.tolist()
+                if as_str and self.kinds[name] == "int":
+                    values = [str(v) for v in values]
+                cols.append(values)
+            yield list(zip(*cols))
+
+    def iter_rows(self, columns=None, as_str=False):
+        """Satır akışı (tuple)"""
+        for rows in self.iter_row_blocks(columns, as_str):
+            yield from rows
+
+
+# ============================================================
+# CSV → COLUMNAR
+# ============================================================
+
+def convert_csv(src, dst=None, header=True, kinds=None, block_rows=BLOCK_ROWS,
+                codec=CODEC, level=LEVEL):
+    """
+    CSV (düz / .gz / .zst) → .acol. header=False ise sütunlar
+    c0, c1, ... adlanır ve ilk satırın genişliği kullanılır.
+    """
+    resolved = storage.resolve(src)
+    if resolved is None:
+        raise FileNotFoundError(src)
+    if dst is None:
+        dst = columnar_path(src)
+
+    rows = storage.iter_rows(resolved)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError(f"Boş CSV: {src}")
+
+    if header:
+        columns = [c.strip() for c in first]
+    else:
+        columns = [f"c{i}" for i in range(len(first))]
+
+    with ColumnarWriter(dst, columns, kinds, block_rows, codec, level) as writer:
+        if not header:
+            writer.write_row(first)
+        writer.write_rows(rows)
+    return dst, writer.rows
+
+
+def columnar_path(path):
+    """astronomy.csv(.gz/.zst) → astronomy.acol"""
+    base = path
+    for suffix in storage.COMPRESSED_SUFFIXES:
+        if base.endswith(suffix):
+            base = base[: -len(suffix)]
+    if base.endswith(".csv"):
+        base = base[:-4]
+    return base + SUFFIX
+
+
+# ============================================================
+# CLI
+#   python columnar.py convert astronomy.csv [astronomy.acol]
+#   python columnar.py bench astronomy.csv astronomy.acol
+# ============================================================
+if __name__ == "__main__":
+    import sys
+    import time
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    cmd = args[0] if args else ""
+
+    if cmd == "convert" and len(args) >= 2:
+        t0 = time.perf_counter()
+        dst, count = convert_csv(args[1], args[2] if len(args) > 2 else None)
+        src_size = os.path.getsize(storage.resolve(args[1])) / 2**20
+        dst_size = os.path.getsize(dst) / 2**20
+        print(f"✅ {count:,} satır → {dst} ({time.perf_counter() - t0:.1f} sn)")
+        print(f"📦 {src_size:.1f} MB → {dst_size:.1f} MB (x{src_size / max(dst_size, 1e-9):.1f})")
+
+    elif cmd == "bench" and len(args) >= 2:
+        for path in args[1:]:
+            tests = [("tüm satırlar", lambda p=path: sum(1 for _ in storage.iter_rows(p)))]
+            if path.endswith(SUFFIX):
+                reader = ColumnarReader(path)
+                text_cols = [c for c in reader.columns if reader.kinds[c] == "text"]
+                tests.append(("sadece text", lambda r=reader, c=text_cols: sum(
+                    1 for _ in r.iter_rows(c)
+                )))
+
+            size = os.path.getsize(path) / 2**20
+            for label, fn in tests:
+                t0 = time.perf_counter()
+                n = fn()
+                elapsed = time.perf_counter() - t0
+                print(
+                    f"{os.path.basename(path):24s} {label:14s} {size:8.1f} MB "
+                    f"{n:>10d} satır {elapsed:6.2f} sn"
+                )
+    else:
+        print("Kullanım: python columnar.py convert <csv> [hedef.acol] | bench <dosya>...")
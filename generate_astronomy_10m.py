@@ -7,12 +7,26 @@
 
 import os
 import random
+import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-OUTPUT_PATH = "/storage/emulated/0/astrollm/dataset/astronomy.csv"
+import numpy as np
+
+import astro_config
+
+OUTPUT_PATH = astro_config.dataset_path("astronomy.csv", "astronomy_csv")
 TOTAL_ROWS = 100_000        # İstersen 1M yapabilirsin
 FLUSH_EVERY = 5_000
 
+# ---- PARALEL / VEKTÖREL ÜRETİM ----
+PARALLEL = True             # False → eski tek süreçli üretim
+SEED = 42                   # Aynı SEED + SHARDS → birebir aynı satırlar
+SHARDS = 8
+WORKERS = os.cpu_count() or 1
+KEEP_SHARDS = False         # True → parça dosyaları birleştirmeden sonra silinmez
+COLUMNAR_OUTPUT = False     # True → ayrıca sıkıştırılmış columnar kopya (astronomy.acol)
+
 # ------------------------------------------------------------
 # CORE VOCAB
 # ------------------------------------------------------------
@@ -98,33 +112,165 @@ def pick_other(obj):
 # SENTENCE GENERATOR
 # ------------------------------------------------------------
 
+# Tek şablon listesi: hem generate_sentence hem generate_rows kullanır
+TEMPLATES = [
+    "{view}, {adj} {obj} için {topic} {act}.",
+    "{obj}, {ref} ile olan etkileşimi nedeniyle {topic} açısından {act}.",
+    "{obj} üzerinde yapılan analizlerde {cause}, bu durum {result}.",
+    "{view} elde edilen verilere göre {obj} yaklaşık {value} km mesafede bulunmaktadır.",
+    "{adj} yapıya sahip olan {obj}, {topic} bakımından bilimsel olarak önemlidir.",
+    "{obj} için {topic} analizi {cause} ve {result}."
+]
+
+
 def generate_sentence():
     obj = random.choice(OBJECTS)
-    ref = pick_other(obj)
-    topic = random.choice(TOPICS)
-    adj = random.choice(ADJECTIVES)
-    view = random.choice(PERSPECTIVES)
-    act = random.choice(ACTIONS)
-    cause = random.choice(CAUSES)
-    result = random.choice(RESULTS)
-    value = human_number()
-
-    templates = [
-        f"{view}, {adj} {obj} için {topic} {act}.",
-        f"{obj}, {ref} ile olan etkileşimi nedeniyle {topic} açısından {act}.",
-        f"{obj} üzerinde yapılan analizlerde {cause}, bu durum {result}.",
-        f"{view} elde edilen verilere göre {obj} yaklaşık {value} km mesafede bulunmaktadır.",
-        f"{adj} yapıya sahip olan {obj}, {topic} bakımından bilimsel olarak önemlidir.",
-        f"{obj} için {topic} analizi {cause} ve {result}."
-    ]
-
-    return random.choice(templates)
+    return random.choice(TEMPLATES).format(
+        obj=obj,
+        ref=pick_other(obj),
+        topic=random.choice(TOPICS),
+        adj=random.choice(ADJECTIVES),
+        view=random.choice(PERSPECTIVES),
+        act=random.choice(ACTIONS),
+        cause=random.choice(CAUSES),
+        result=random.choice(RESULTS),
+        value=human_number(),
+    )
+
+# ------------------------------------------------------------
+# VECTORIZED GENERATOR (NumPy index dizileri)
+# ------------------------------------------------------------
+
+def shard_rng(seed, shard_id):
+    # Her parça kendi bağımsız, tekrar üretilebilir akışına sahip
+    return np.random.default_rng([seed, shard_id])
+
+
+def generate_rows(rng, n):
+    """
+    n satırlık (topic, text) listesi.
+    Tüm seçimler tek seferde index dizisi olarak çekilir.
+    """
+    obj = rng.integers(len(OBJECTS), size=n)
+    ref = rng.integers(len(OBJECTS), size=n)
+    retry = rng.integers(len(OBJECTS), size=n)
+    ref = np.where(ref == obj, retry, ref)
+
+    topic = rng.integers(len(TOPICS), size=n)
+    adj = rng.integers(len(ADJECTIVES), size=n)
+    view = rng.integers(len(PERSPECTIVES), size=n)
+    act = rng.integers(len(ACTIONS), size=n)
+    cause = rng.integers(len(CAUSES), size=n)
+    result = rng.integers(len(RESULTS), size=n)
+    tpl = rng.integers(len(TEMPLATES), size=n)
+    row_topic = rng.integers(len(TOPICS), size=n)
+
+    number = rng.integers(10_000, 10_000_001, size=n)
+    values = np.where(
+        number >= 1_000_000,
+        np.char.add((number // 1_000_000).astype(str), " milyon"),
+        np.char.add((number // 1_000).astype(str), " bin"),
+    )
+
+    rows = []
+    for i in range(n):
+        text = TEMPLATES[tpl[i]].format(
+            obj=OBJECTS[obj[i]],
+            ref=OBJECTS[ref[i]],
+            topic=TOPICS[topic[i]],
+            adj=ADJECTIVES[adj[i]],
+            view=PERSPECTIVES[view[i]],
+            act=ACTIONS[act[i]],
+            cause=CAUSES[cause[i]],
+            result=RESULTS[result[i]],
+            value=values[i],
+        )
+        rows.append((TOPICS[row_topic[i]], text))
+    return rows
+
+
+def shard_ranges(total, shards):
+    """1 tabanlı satır id aralıkları: [(start, stop), ...]"""
+    bounds = np.linspace(0, total, shards + 1).astype(np.int64)
+    return [(int(a) + 1, int(b) + 1) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def shard_path(shard_id):
+    return f"{OUTPUT_PATH}.parts/part-{shard_id:05d}.csv"
+
+
+def write_shard(shard_id, start, stop, seed, path):
+    """Başlıksız parça CSV yazar; birleştirilince tek veri seti olur."""
+    rng = shard_rng(seed, shard_id)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk_start in range(start, stop, FLUSH_EVERY):
+            n = min(FLUSH_EVERY, stop - chunk_start)
+            f.writelines(
+                f"{i},{topic},\"{text}\"\n"
+                for i, (topic, text) in enumerate(generate_rows(rng, n), chunk_start)
+            )
+
+    return shard_id, stop - start
+
+
+def merge_shards(paths, out_path):
+    with open(out_path, "wb") as out:
+        out.write("id,topic,text\n".encode("utf-8"))
+        for p in paths:
+            with open(p, "rb") as f:
+                shutil.copyfileobj(f, out, 1 << 20)
 
 # ------------------------------------------------------------
 # MAIN
 # ------------------------------------------------------------
 
+def write_columnar():
+    from columnar import convert_csv
+
+    start = time.time()
+    dst, count = convert_csv(OUTPUT_PATH)
+    ratio = os.path.getsize(OUTPUT_PATH) / max(os.path.getsize(dst), 1)
+    print(f"📦 columnar: {dst} | {count:,} satır | x{ratio:.1f} küçük | {time.time() - start:.1f} sn")
+
+
+def main_parallel():
+    os.makedirs(os.path.dirname(shard_path(0)), exist_ok=True)
+
+    start = time.time()
+    ranges = shard_ranges(TOTAL_ROWS, SHARDS)
+    paths = [shard_path(i) for i in range(len(ranges))]
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+        futures = [
+            pool.submit(write_shard, i, a, b, SEED, paths[i])
+            for i, (a, b) in enumerate(ranges)
+        ]
+        for fut in as_completed(futures):
+            shard_id, count = fut.result()
+            done += count
+            elapsed = time.time() - start
+            print(f"✅ parça {shard_id:05d} | {done:,} satır | {elapsed:.1f} sn")
+
+    # Parçalar id sırasıyla birleştirilir → çıktı worker sayısından bağımsız
+    merge_shards(paths, OUTPUT_PATH)
+
+    if not KEEP_SHARDS:
+        shutil.rmtree(os.path.dirname(paths[0]), ignore_errors=True)
+
+    if COLUMNAR_OUTPUT:
+        write_columnar()
+
+    print("\n🎉 TAMAMLANDI")
+    print(f"📁 {OUTPUT_PATH}")
+    print(f"📊 Toplam satır: {TOTAL_ROWS:,} | parça: {SHARDS} | seed: {SEED}")
+
+
 def main():
+    if PARALLEL:
+        return main_parallel()
+
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
 
     start = time.time()
@@ -141,6 +287,9 @@ def main():
                 elapsed = time.time() - start
                 print(f"✅ {i:,} satır yazıldı | {elapsed:.1f} sn")
 
+    if COLUMNAR_OUTPUT:
+        write_columnar()
+
     print("\n🎉 TAMAMLANDI")
     print(f"📁 {OUTPUT_PATH}")
     print(f"📊 Toplam satır: {TOTAL_ROWS:,}")
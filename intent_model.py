@@ -3,11 +3,15 @@
 # Offline • Free • CSV Train • Explainable • Android Friendly
 # ============================================================
 
-import csv
+import json
 import os
-import math
+import zipfile
+import zlib
 import numpy as np
-from collections import defaultdict
+from collections import Counter
+
+import astro_config
+import storage
 
 
 class AdvancedIntentModel:
@@ -20,6 +24,8 @@ class AdvancedIntentModel:
     - TF-IDF benzeri ağırlıklandırma
     - N-gram bağlam
     - Confidence + unknown intent
+    - fit_vocabulary sonrası salt okunur (thread-safe) inference
+    - hashing=True → sözlüksüz feature hashing (sabit bucket uzayı)
     """
 
     # --------------------------------------------------------
@@ -33,6 +39,7 @@ class AdvancedIntentModel:
         ngram_range=(1, 2),
         unknown_threshold=0.40,
         seed=42,
+        hashing=False,
     ):
         np.random.seed(seed)
 
@@ -42,11 +49,19 @@ class AdvancedIntentModel:
         self.num_intents = len(intents)
 
         # ---- VOCAB ----
+        # hashing modunda vocab boş kalır; vocab_size = bucket sayısı
+        self.hashing = hashing
         self.vocab = {}
-        self.idf = defaultdict(lambda: 1.0)
         self.next_id = 0
         self.vocab_size = vocab_size
 
+        # Özellik id'si başına doküman sayacı (1.0 başlangıç)
+        self.idf = np.ones(vocab_size, dtype=np.float64)
+
+        # fit_vocabulary sonrası: vocab + IDF dondurulur
+        self.frozen = False
+        self.idf_weights = None
+
         self.ngram_range = ngram_range
         self.unknown_threshold = unknown_threshold
 
@@ -57,6 +72,9 @@ class AdvancedIntentModel:
         self.W2 = np.random.randn(hidden_dim, self.num_intents).astype(np.float32) * 0.01
         self.b2 = np.zeros(self.num_intents, dtype=np.float32)
 
+        # int8 kayıttan yüklenen modelde satır ölçekleri (yoksa None)
+        self.W1_scale = None
+
         # ---- STATS ----
         self.total_samples = 0
 
@@ -80,79 +98,225 @@ class AdvancedIntentModel:
     # --------------------------------------------------------
     # VECTORIZE (TF-IDF LIKE)
     # --------------------------------------------------------
-    def vectorize(self, text):
-        vec = np.zeros(self.vocab_size, dtype=np.float32)
+    def _bucket(self, feature):
+        # Süreçten bağımsız, kararlı hash (hash() tuzlu olduğu için değil)
+        return zlib.crc32(feature.encode("utf-8")) % self.vocab_size
 
+    def _count_features(self, text):
+        """Metin → {özellik id: sayı}"""
         tokens = self.tokenize(text)
         features = tokens + self.build_ngrams(tokens)
 
-        seen = set()
+        counts = {}
+
+        if self.hashing:
+            for f in features:
+                idx = self._bucket(f)
+                counts[idx] = counts.get(idx, 0.0) + 1.0
+            return counts
 
         for f in features:
-            if f not in self.vocab:
-                if self.next_id >= self.vocab_size:
+            idx = self.vocab.get(f)
+            if idx is None:
+                if self.frozen or self.next_id >= self.vocab_size:
                     continue
-                self.vocab[f] = self.next_id
+                idx = self.vocab[f] = self.next_id
                 self.next_id += 1
 
-            idx = self.vocab[f]
-            vec[idx] += 1.0
+            counts[idx] = counts.get(idx, 0.0) + 1.0
 
-            if f not in seen:
-                self.idf[f] += 1.0
-                seen.add(f)
+        return counts
 
+    def _observe(self, counts):
+        # Dondurulmamış modelde doküman frekansı güncellenir
+        if not self.frozen and counts:
+            self.idf[np.fromiter(counts, dtype=np.int64, count=len(counts))] += 1.0
+
+    def _weigh(self, counts):
         # ---- IDF & NORMALIZE ----
-        for f in seen:
-            idx = self.vocab[f]
-            vec[idx] *= math.log(1 + self.total_samples / self.idf[f])
+        n = len(counts)
+        indices = np.fromiter(counts, dtype=np.int64, count=n)
+        values = np.fromiter(counts.values(), dtype=np.float32, count=n)
+
+        if self.frozen:
+            values *= self.idf_weights[indices]
+        else:
+            values *= np.log(1 + self.total_samples / self.idf[indices])
 
-        norm = np.linalg.norm(vec)
+        norm = np.linalg.norm(values)
         if norm > 0:
-            vec /= norm
+            values /= norm
+
+        return indices, values
+
+    def vectorize_sparse(self, text):
+        """
+        Seyrek TF-IDF: (indices, values)
+        Dense vectorize ile aynı ağırlıklar, sadece aktif özellikler.
+        """
+        counts = self._count_features(text)
+        self._observe(counts)
+        return self._weigh(counts)
 
+    # --------------------------------------------------------
+    # VOCAB FIT (FROZEN)
+    # --------------------------------------------------------
+    def fit_vocabulary(self, samples):
+        """
+        Tek geçişte doküman frekanslarını sayar, en sık vocab_size
+        özelliği seçer; vocab ve IDF dizisini dondurur.
+
+        samples: (text, intent) çiftleri veya düz metinler (generator olabilir)
+        """
+        texts = (s if isinstance(s, str) else s[0] for s in samples)
+        df = np.zeros(self.vocab_size, dtype=np.float64)
+        n_docs = 0
+
+        if self.hashing:
+            # Bucket bazlı frekans, sözlük yok
+            for text in texts:
+                ids = self._count_features(text)
+                df[np.fromiter(ids, dtype=np.int64, count=len(ids))] += 1.0
+                n_docs += 1
+        else:
+            counter = Counter()
+            for text in texts:
+                tokens = self.tokenize(text)
+                # dict.fromkeys: tekil ama ilk görülme sırasında (set sırası
+                # PYTHONHASHSEED'e bağlıdır)
+                counter.update(dict.fromkeys(tokens + self.build_ngrams(tokens), 1))
+                n_docs += 1
+
+            # Eşit frekansta ilk görülen önce gelir (most_common kararlı sıralar)
+            selected = counter.most_common(self.vocab_size)
+
+            self.vocab = {f: i for i, (f, _) in enumerate(selected)}
+            self.next_id = len(self.vocab)
+            df[:len(selected)] = [c for _, c in selected]
+
+        self.idf = 1.0 + df
+        self.total_samples = n_docs
+        self.idf_weights = np.log(1 + n_docs / self.idf).astype(np.float32)
+
+        self.frozen = True
+        return self
+
+    def vectorize_batch(self, texts):
+        """Metin listesi → CSR (indptr, indices, values)"""
+        return self._stack([self.vectorize_sparse(t) for t in texts])
+
+    @staticmethod
+    def _stack(rows):
+        """(indices, values) listesi → CSR (indptr, indices, values)"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(i) for i, _ in rows], out=indptr[1:])
+        if not rows:
+            return indptr, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        indices = np.concatenate([i for i, _ in rows]).astype(np.int64, copy=False)
+        values = np.concatenate([v for _, v in rows]).astype(np.float32, copy=False)
+        return indptr, indices, values
+
+    @staticmethod
+    def _take_rows(matrix, rows):
+        """CSR matrisinden satır alt kümesi"""
+        indptr, indices, values = matrix
+        starts = indptr[rows]
+        lengths = indptr[rows + 1] - starts
+
+        sub_ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=sub_ptr[1:])
+
+        pos = np.repeat(starts - sub_ptr[:-1], lengths) + np.arange(sub_ptr[-1])
+        return sub_ptr, indices[pos], values[pos]
+
+    def vectorize(self, text):
+        vec = np.zeros(self.vocab_size, dtype=np.float32)
+        indices, values = self.vectorize_sparse(text)
+        vec[indices] = values
         return vec
 
     # --------------------------------------------------------
     # FORWARD
     # --------------------------------------------------------
     def forward(self, x):
-        h = np.maximum(0, x @ self.W1 + self.b1)
-        return h @ self.W2 + self.b2
+        indices = np.flatnonzero(x)
+        return self.forward_sparse(indices, x[indices])
+
+    def _w1_rows(self, indices):
+        # float16 / int8 kayıtlı ağırlıklar float32'ye açılır
+        rows = self.W1[indices]
+        if self.W1_scale is not None:
+            rows = rows.astype(np.float32) * self.W1_scale[indices, None]
+        return rows
+
+    def hidden_sparse(self, indices, values):
+        # x @ W1 == aktif W1 satırlarının ağırlıklı toplamı
+        return np.maximum(0, values @ self._w1_rows(indices) + self.b1)
+
+    def forward_sparse(self, indices, values):
+        return self.hidden_sparse(indices, values) @ self.W2 + self.b2
+
+    def hidden_batch(self, matrix):
+        """CSR batch için gizli katman: satır başına aktif W1 satırlarının toplamı"""
+        indptr, indices, values = matrix
+        starts = indptr[:-1]
+
+        contrib = values[:, None] * self._w1_rows(indices)
+        # reduceat son satır / boş satırlar için sıfır satır eklenir
+        contrib = np.vstack([contrib, np.zeros((1, self.W1.shape[1]), dtype=np.float32)])
+
+        sums = np.add.reduceat(contrib, starts, axis=0)
+        sums[indptr[1:] == starts] = 0.0
+
+        return np.maximum(0, sums + self.b1)
 
     def softmax(self, z):
-        z = z - np.max(z)
+        # 1D veya satır bazlı 2D
+        z = z - np.max(z, axis=-1, keepdims=True)
         exp = np.exp(z)
-        return exp / (np.sum(exp) + 1e-9)
+        return exp / (np.sum(exp, axis=-1, keepdims=True) + 1e-9)
 
     # --------------------------------------------------------
     # CSV TRAIN LOADER
     # --------------------------------------------------------
-    def load_train_csv(self, path):
+    def iter_train_csv(self, path):
         """
         CSV format:
         text,intent
-        """
-        samples = []
 
-        if not os.path.exists(path):
+        Satırları akış halinde üretir (fit_vocabulary için).
+        """
+        resolved = storage.resolve(path)
+        if resolved is None:
             raise FileNotFoundError(f"train.csv bulunamadı: {path}")
 
-        with open(path, encoding="utf-8") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) < 2:
-                    continue
-                text, intent = row[0].strip(), row[1].strip()
-                if text and intent:
-                    samples.append((text, intent))
+        # Düz / .gz / .zst CSV
+        for i, row in enumerate(storage.iter_rows(resolved)):
+            if len(row) < 2:
+                continue
+            if i == 0 and [c.strip().lower() for c in row[:2]] == ["text", "intent"]:
+                continue  # başlık satırı
+            text, intent = row[0].strip(), row[1].strip()
+            if text and intent:
+                yield text, intent
 
-        return samples
+    def load_train_csv(self, path):
+        return list(self.iter_train_csv(path))
 
     # --------------------------------------------------------
     # TRAIN
     # --------------------------------------------------------
-    def train(self, samples, lr=0.01, epochs=5, verbose=True):
+    def train(self, samples, lr=0.01, epochs=5, verbose=True, batch_size=None):
+        """
+        batch_size=None → örnek bazlı SGD (eski davranış)
+        batch_size=N    → mini-batch, vektörel eğitim (train_batched)
+        """
+        self._check_trainable()
+
+        if batch_size:
+            return self.train_batched(samples, lr=lr, epochs=epochs,
+                                      batch_size=batch_size, verbose=verbose)
+
         for epoch in range(epochs):
             np.random.shuffle(samples)
             loss_sum = 0.0
@@ -161,19 +325,19 @@ class AdvancedIntentModel:
                 if label not in self.intent_to_id:
                     continue
 
-                x = self.vectorize(text)
+                idx, vals = self.vectorize_sparse(text)
 
                 y = np.zeros(self.num_intents, dtype=np.float32)
                 y[self.intent_to_id[label]] = 1.0
 
-                logits = self.forward(x)
+                h = self.hidden_sparse(idx, vals)
+                logits = h @ self.W2 + self.b2
                 probs = self.softmax(logits)
 
                 loss = -np.sum(y * np.log(probs + 1e-9))
                 loss_sum += loss
 
                 grad_logits = probs - y
-                h = np.maximum(0, x @ self.W1 + self.b1)
 
                 self.W2 -= lr * np.outer(h, grad_logits)
                 self.b2 -= lr * grad_logits
@@ -181,20 +345,96 @@ class AdvancedIntentModel:
                 grad_h = self.W2 @ grad_logits
                 grad_h[h <= 0] = 0
 
-                self.W1 -= lr * np.outer(x, grad_h)
+                # Sadece aktif satırlar güncellenir
+                self.W1[idx] -= lr * np.outer(vals, grad_h)
                 self.b1 -= lr * grad_h
 
-                self.total_samples += 1
+                if not self.frozen:
+                    self.total_samples += 1
 
             if verbose:
                 print(f"[epoch {epoch+1}] loss={loss_sum/max(len(samples),1):.4f}")
 
+    def _check_trainable(self):
+        if self.W1_scale is not None:
+            raise RuntimeError("int8 kayıttan yüklenen model sadece inference içindir")
+
+    def prepare_matrix(self, samples):
+        """
+        Eğitim setini bir kez vektörleştirir → (CSR matris, etiketler)
+        Önce doküman frekansları sayılır, sonra ağırlıklar hesaplanır.
+        """
+        counts, labels = [], []
+
+        for text, label in samples:
+            if label not in self.intent_to_id:
+                continue
+            c = self._count_features(text)
+            self._observe(c)
+            counts.append(c)
+            labels.append(self.intent_to_id[label])
+
+        if not self.frozen:
+            self.total_samples += len(counts)
+
+        matrix = self._stack([self._weigh(c) for c in counts])
+        return matrix, np.asarray(labels, dtype=np.int64)
+
+    def train_batched(self, samples, lr=0.01, epochs=5, batch_size=256, verbose=True):
+        """
+        Mini-batch eğitim: gradyanlar batch ortalamasıdır,
+        W1'de sadece batch'te geçen satırlar güncellenir.
+        """
+        self._check_trainable()
+
+        matrix, labels = self.prepare_matrix(samples)
+        n = len(labels)
+
+        for epoch in range(epochs):
+            order = np.random.permutation(n)
+            loss_sum = 0.0
+
+            for start in range(0, n, batch_size):
+                rows = order[start:start + batch_size]
+                y = labels[rows]
+                B = len(rows)
+
+                batch = self._take_rows(matrix, rows)
+                indptr, indices, values = batch
+
+                h = self.hidden_batch(batch)
+                probs = self.softmax(h @ self.W2 + self.b2)
+
+                loss_sum += -np.sum(np.log(probs[np.arange(B), y] + 1e-9))
+
+                grad_logits = probs
+                grad_logits[np.arange(B), y] -= 1.0
+                grad_logits /= B
+
+                grad_h = grad_logits @ self.W2.T
+                grad_h[h <= 0] = 0
+
+                self.W2 -= lr * (h.T @ grad_logits)
+                self.b2 -= lr * grad_logits.sum(axis=0)
+
+                # ---- W1: sadece dokunulan satırlar ----
+                row_of = np.repeat(np.arange(B), np.diff(indptr))
+                touched, inverse = np.unique(indices, return_inverse=True)
+                grad_rows = np.zeros((len(touched), self.W1.shape[1]), dtype=np.float32)
+                np.add.at(grad_rows, inverse, values[:, None] * grad_h[row_of])
+
+                self.W1[touched] -= lr * grad_rows
+                self.b1 -= lr * grad_h.sum(axis=0)
+
+            if verbose:
+                print(f"[epoch {epoch+1}] loss={loss_sum/max(n,1):.4f}")
+
     # --------------------------------------------------------
     # PREDICT
     # --------------------------------------------------------
     def predict(self, text):
-        x = self.vectorize(text)
-        logits = self.forward(x)
+        idx, vals = self.vectorize_sparse(text)
+        logits = self.forward_sparse(idx, vals)
         probs = self.softmax(logits)
 
         best_id = int(np.argmax(probs))
@@ -205,6 +445,195 @@ class AdvancedIntentModel:
 
         return self.id_to_intent[best_id], confidence
 
+    def predict_batch(self, texts, top_k=3, chunk_size=1024):
+        """
+        Toplu tahmin (offline log sınıflandırma için)
+
+        Dönüş:
+        - intents      : (n,)   intent adı ("unknown" eşik altı)
+        - confidences  : (n,)   en yüksek olasılık
+        - top_intents  : (n, k) olasılığa göre sıralı intent adları
+        - top_probs    : (n, k) karşılık gelen olasılıklar
+        """
+        names = np.array(self.intents, dtype=object)
+        k = max(1, min(top_k, self.num_intents))
+
+        texts = list(texts)
+        n = len(texts)
+
+        intents = np.empty(n, dtype=object)
+        confidences = np.zeros(n, dtype=np.float32)
+        top_intents = np.empty((n, k), dtype=object)
+        top_probs = np.zeros((n, k), dtype=np.float32)
+
+        # Büyük girdilerde (n x intent) olasılık matrisi parça parça üretilir
+        for start in range(0, n, chunk_size):
+            chunk = texts[start:start + chunk_size]
+            rows = slice(start, start + len(chunk))
+
+            h = self.hidden_batch(self.vectorize_batch(chunk))
+            probs = self.softmax(h @ self.W2 + self.b2)
+
+            top = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+            top_p = np.take_along_axis(probs, top, axis=1)
+            order = np.argsort(-top_p, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_p = np.take_along_axis(top_p, order, axis=1)
+
+            best = names[top[:, 0]]
+            conf = top_p[:, 0]
+            best[conf < self.unknown_threshold] = "unknown"
+
+            intents[rows] = best
+            confidences[rows] = conf
+            top_intents[rows] = names[top]
+            top_probs[rows] = top_p
+
+        return intents, confidences, top_intents, top_probs
+
+    # --------------------------------------------------------
+    # SAVE / LOAD
+    # --------------------------------------------------------
+    def save(self, path, dtype="float32"):
+        """
+        Tek dosya, sıkıştırmasız .npz:
+        W1, b1, W2, b2, IDF, vocab + intent tablosu, meta (json)
+
+        dtype: "float32" | "float16" | "int8" (W1 için, int8 satır ölçekli)
+        """
+        if dtype not in ("float32", "float16", "int8"):
+            raise ValueError(f"Desteklenmeyen dtype: {dtype}")
+
+        W1 = self._w1_rows(np.arange(self.vocab_size)).astype(np.float32)
+        arrays = {}
+
+        if dtype == "int8":
+            scale = np.abs(W1).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            arrays["W1"] = np.round(W1 / scale[:, None]).astype(np.int8)
+            arrays["W1_scale"] = scale.astype(np.float32)
+        else:
+            arrays["W1"] = W1.astype(dtype)
+
+        features = sorted(self.vocab, key=self.vocab.get)
+
+        meta = {
+            "vocab_size": self.vocab_size,
+            "hidden_dim": int(self.b1.shape[0]),
+            "ngram_range": list(self.ngram_range),
+            "unknown_threshold": self.unknown_threshold,
+            "total_samples": self.total_samples,
+            "next_id": self.next_id,
+            "frozen": self.frozen,
+            "hashing": self.hashing,
+        }
+
+        arrays.update(
+            b1=self.b1,
+            W2=self.W2,
+            b2=self.b2,
+            idf_counts=self.idf,
+            vocab=_encode_lines(features),
+            intents=_encode_lines(self.intents),
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+        )
+        if self.frozen:
+            arrays["idf_weights"] = self.idf_weights
+
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        mmap=True → W1 doğrudan dosyadan copy-on-write eşlenir;
+        süreçler sayfaları paylaşır, yükleme milisaniyeler sürer.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model bulunamadı: {path}")
+
+        with np.load(path) as data:
+            small = {k: data[k] for k in data.files if k != "W1"}
+            W1 = None if mmap else data["W1"]
+
+        if mmap:
+            W1 = _memmap_npz_member(path, "W1")
+
+        meta = json.loads(bytes(small["meta"]).decode("utf-8"))
+        intents = _decode_lines(small["intents"])
+        features = _decode_lines(small["vocab"])
+
+        # __init__ rastgele W1 ayırmasın diye doğrudan kurulur
+        model = cls.__new__(cls)
+        model.intents = intents
+        model.intent_to_id = {i: idx for idx, i in enumerate(intents)}
+        model.id_to_intent = {idx: i for i, idx in model.intent_to_id.items()}
+        model.num_intents = len(intents)
+
+        model.hashing = meta["hashing"]
+        model.vocab = {f: i for i, f in enumerate(features)}
+        model.idf = small["idf_counts"].astype(np.float64)
+        model.next_id = meta["next_id"]
+        model.vocab_size = meta["vocab_size"]
+
+        model.frozen = meta["frozen"]
+        model.idf_weights = small.get("idf_weights")
+
+        model.ngram_range = tuple(meta["ngram_range"])
+        model.unknown_threshold = meta["unknown_threshold"]
+
+        model.W1 = W1
+        model.W1_scale = small.get("W1_scale")
+        model.b1 = small["b1"]
+        model.W2 = small["W2"]
+        model.b2 = small["b2"]
+
+        model.total_samples = meta["total_samples"]
+        return model
+
+
+# ============================================================
+# SERIALIZATION HELPERS
+# ============================================================
+def _encode_lines(items):
+    # Özellik / intent adları boşluk içermez → satır bazlı tablo
+    return np.frombuffer("\n".join(items).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_lines(arr):
+    text = bytes(arr).decode("utf-8")
+    return text.split("\n") if text else []
+
+
+def _memmap_npz_member(path, name):
+    """
+    Sıkıştırmasız .npz içindeki bir diziyi np.memmap ile açar
+    (zip yerel başlığı + .npy başlığı atlanır).
+    """
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(name + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} sıkıştırılmış, mmap yapılamaz")
+
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local = f.read(30)
+        name_len = int.from_bytes(local[26:28], "little")
+        extra_len = int.from_bytes(local[28:30], "little")
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    return np.memmap(
+        path, dtype=dtype, mode="c", shape=shape,
+        order="F" if fortran else "C", offset=offset,
+    )
+
 
 # ============================================================
 # SELF TEST
@@ -218,12 +647,23 @@ if __name__ == "__main__":
     INTENTS[3] = "how_it_works"
     INTENTS[-1] = "unknown"
 
-    model = AdvancedIntentModel(INTENTS)
+    TRAIN_PATH = astro_config.dataset_path("train.csv", "train_csv")
+    MODEL_PATH = astro_config.dataset_path("intent_model.npz", "intent_model")
 
-    TRAIN_PATH = "/storage/emulated/0/astrollm/dataset/train.csv"
-    samples = model.load_train_csv(TRAIN_PATH)
+    if os.path.exists(MODEL_PATH):
+        model = AdvancedIntentModel.load(MODEL_PATH)
+    else:
+        model = AdvancedIntentModel(INTENTS)
+        model.fit_vocabulary(model.iter_train_csv(TRAIN_PATH))
+        samples = model.load_train_csv(TRAIN_PATH)
 
-    model.train(samples, epochs=10)
+        # Tekilleştirilmiş küçük train.csv'de epoch başına batch sayısı az:
+        # toplam güncelleme sayısı en az MIN_UPDATES olacak şekilde epoch
+        MIN_UPDATES, BATCH = 200, 256
+        batches = max(1, -(-len(samples) // BATCH))
+        epochs = max(10, -(-MIN_UPDATES // batches))
+        model.train(samples, lr=1.0, epochs=epochs, batch_size=BATCH)
+        model.save(MODEL_PATH)
 
     tests = [
         "en tehlikeli asteroid hangisi",
@@ -235,4 +675,4 @@ if __name__ == "__main__":
 
     for t in tests:
         intent, conf = model.predict(t)
-        print(f"{t} -> {intent} ({conf:.2f})")
\ No newline at end of file
+        print(f"{t} -> {intent} ({conf:.2f})")
@@ -2,52 +2,969 @@
 # Knowledge Base – HARD CLEAN (UTF-8 SAFE)
 # ============================================================
 
-import csv
+import hashlib
+import json
+import mmap
 import os
 import re
+import struct
+import time
+from bisect import bisect_left
+from array import array
+from collections import Counter, defaultdict, deque
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+try:
+    from near_dup import NearDuplicateFilter
+except Exception:
+    NearDuplicateFilter = None
+
+import astro_config
+import storage
+from train_builder import validation_path
+
+TOKEN_RE = re.compile(r"\w+")
+CONTROL_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+SYMBOL_RE = re.compile(r"[^\w\sğüşöçıİĞÜŞÖÇ\.\,\-\(\)]")
+BLOCKED = ("http", "www", ".png", ".jpg")
+
+SNAPSHOT_MAGIC = b"AKBSNAP1"
+SNAPSHOT_VERSION = 1
+
+# Akışlı yükleme
+CHUNK_ROWS = 5000          # işçiye gönderilen satır sayısı
+PROGRESS_EVERY = 100000    # kaç satırda bir ilerleme yazılır
+
+# Arama: bu uzunluktan kısa sorgu kelimeleri önek genişletmesi yapmaz
+MIN_PREFIX_LEN = 3
+
+
+# ============================================================
+# TEMİZLİK (işçi süreçlerde de çalışır → modül seviyesinde)
+# ============================================================
+
+def clean_text(text: str) -> str:
+    # UTF-8 dışı her şeyi sil
+    text = text.encode("utf-8", errors="ignore").decode("utf-8")
+
+    # Kontrol karakterleri
+    text = CONTROL_RE.sub(" ", text)
+
+    # Aşırı sembol temizliği
+    text = SYMBOL_RE.sub(" ", text)
+
+    return text.strip()
+
+
+def is_valid_text(text: str) -> bool:
+    if len(text) < 30:
+        return False
+    lower = text.lower()
+    if any(x in lower for x in BLOCKED):
+        return False
+    return True
+
+
+def clean_rows(rows):
+    """CSV satır parçası → geçerli, temizlenmiş hücreler (sıra korunur)"""
+    out = []
+    for row in rows:
+        for cell in row:
+            clean = clean_text(cell)
+            if is_valid_text(clean):
+                out.append(clean)
+    return out
+
+
+def _read_chunks(path, chunk_rows):
+    # Columnar kaynakta sadece metin sütunları (kategori / id bilgi değildir)
+    return storage.iter_row_chunks(path, chunk_rows, kinds=("text",))
+
+
+def _training_files():
+    """Train builder çıktıları (train.csv + validation kardeşi): KB kaynağı değil"""
+    trains = {"train.csv", os.path.basename(astro_config.dataset_path("train.csv", "train_csv"))}
+    names = trains | {validation_path(t) for t in trains}
+    return {storage.dataset_stem(n)[0] for n in names if storage.dataset_stem(n)}
+
+
+def _scan_dir(directory):
+    """
+    Dizindeki veri dosyaları, isim sırasıyla. Aynı veri birden çok biçimde
+    varsa (x.csv + x.csv.gz + x.acol) sadece biri alınır (storage sırası);
+    train / validation çıktıları atlanır.
+    """
+    excluded = _training_files()
+    chosen = {}
+    for name in os.listdir(directory):
+        stem = storage.dataset_stem(name)
+        if stem is None or stem[0] in excluded:
+            continue
+        if stem[0] not in chosen or stem[1] < chosen[stem[0]][0]:
+            chosen[stem[0]] = (stem[1], name)
+    return [os.path.join(directory, chosen[s][1]) for s in sorted(chosen)]
+
+
+def resolve_sources(sources):
+    """
+    Dizin → içindeki veri dosyaları (*.csv, *.csv.gz, *.csv.zst, *.acol;
+    isim sırasıyla, aynı verinin tek biçimi, train çıktıları hariç).
+    Dosya yoksa sıkıştırılmış kardeşi denenir; snapshot sadece açıkça
+    verilirse kaynak olur (KB'nin kendi snapshot'ı dizinde durabilir).
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+
+    paths = []
+    for src in sources:
+        if os.path.isdir(src):
+            paths.extend(_scan_dir(src))
+        else:
+            paths.append(storage.resolve(os.fspath(src)) or os.fspath(src))
+    return paths
+
+
+def _load_part(path, texts_only, memory_budget_mb=None):
+    """
+    İşçi süreç: tek dosyayı temizler (ve texts_only değilse indeksler).
+    Dosya yoksa None.
+    """
+    if not storage.exists(path):
+        return None
+
+    path = storage.resolve(path)
+    t0 = time.perf_counter()
+    if texts_only:
+        texts, size, truncated = [], 0, False
+        budget = memory_budget_mb * 1024 * 1024 if memory_budget_mb else None
+        for chunk in _read_chunks(path, CHUNK_ROWS):
+            cleaned = clean_rows(chunk)
+            texts.extend(cleaned)
+            size += sum(len(t) + 49 for t in cleaned)
+            if budget and size > budget:
+                truncated = True
+                break
+        return {"texts": texts, "truncated": truncated, "seconds": time.perf_counter() - t0}
+
+    kb = KnowledgeBase(streaming=True, workers=1, memory_budget_mb=memory_budget_mb)
+    kb.load_file_streaming(path, verbose=False)
+    return {"kb": kb, "seconds": time.perf_counter() - t0}
+
+
+# ============================================================
+# SNAPSHOT HELPERS
+# ============================================================
+
+def read_snapshot(path):
+    """Snapshot → (header, {bölüm: mmap'li NumPy dizisi}); geçersizse None"""
+    if np is None or not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            return None
+        (head_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(head_len))
+        base = f.tell()
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if header.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    arrays = {}
+    for name, (offset, count, dtype) in header["sections"].items():
+        arrays[name] = np.frombuffer(
+            buf, dtype=np.dtype(dtype), count=count, offset=base + offset
+        )
+    return header, arrays
+
+
+def read_snapshot_documents(path):
+    """Snapshot'taki temiz dokümanlar (tembel liste)"""
+    snap = read_snapshot(path)
+    if snap is None:
+        raise ValueError(f"Geçersiz KB snapshot: {path}")
+    _, arrays = snap
+    return _MappedDocuments(arrays["text"], arrays["doc_offsets"])
+
+
+def _file_sha1(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _fingerprint(path):
+    if not os.path.exists(path):
+        return {"path": os.path.abspath(path), "exists": False}
+    st = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "exists": True,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha1": _file_sha1(path),
+    }
+
+
+def _source_unchanged(saved):
+    """
+    mtime + boyut aynıysa dosya değişmemiş sayılır; sadece mtime
+    değiştiyse içerik hash'i ile doğrulanır.
+    """
+    path = saved["path"]
+    if not os.path.exists(path):
+        return not saved["exists"]
+    if not saved["exists"]:
+        return False
+
+    st = os.stat(path)
+    if st.st_size != saved["size"]:
+        return False
+    if st.st_mtime_ns == saved["mtime_ns"]:
+        return True
+    return _file_sha1(path) == saved["sha1"]
+
+
+class _MappedDocuments(Sequence):
+    """UTF-8 blob + offset dizisi üzerinde tembel doküman listesi"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return bytes(self.blob[start:end]).decode("utf-8")
+
+
+class DocumentArena(_MappedDocuments):
+    """
+    Büyüyebilir doküman deposu: tek UTF-8 bytearray + int64 offset dizisi.
+    Doküman başına Python str nesnesi tutulmaz; okunurken çözülür.
+    """
+
+    def __init__(self, docs=()):
+        super().__init__(bytearray(), array("q", [0]))
+        for doc in docs:
+            self.append(doc)
+
+    def append(self, text):
+        self.blob += text.encode("utf-8")
+        self.offsets.append(len(self.blob))
+
+    @property
+    def nbytes(self):
+        return len(self.blob) + self.offsets.itemsize * len(self.offsets)
+
+
+def _int_array():
+    return array("i")
+
+
+class _MappedPostings(Mapping):
+    """token → (salt okunur) NumPy dilimi"""
+
+    def __init__(self, term_ids, offsets, values):
+        self.term_ids = term_ids
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.term_ids)
+
+    def __iter__(self):
+        return iter(self.term_ids)
+
+    def __getitem__(self, term):
+        i = self.term_ids[term]
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
 
 class KnowledgeBase:
-    def __init__(self):
+    """
+    Temiz metin deposu + ters indeks (token → doküman id listesi)
+
+    Arama modları:
+    - "index"  : sorgu kelimesiyle başlayan terimlerin (kısa kelimelerde
+                 birebir terimin) dokümanlarına bakar; dokümanlar taranmaz
+    - "legacy" : eski doğrusal alt-dize taraması (uyumluluk modu)
+
+    Sıralama (index modunda):
+    - "count" : eşleşen sorgu kelimesi sayısı
+    - "bm25"  : Okapi BM25 (NumPy ile vektörel skor)
+
+    near_dup: 0–1 benzerlik eşiği; verilirse yükleme sırasında
+    SimHash ile yakın kopya dokümanlar atlanır
+
+    Akışlı yükleme (streaming=True):
+    - CSV parça parça okunur, temizlik `workers` süreçte yapılır
+    - dokümanlar DocumentArena'da, posting listeleri array('i') ile tutulur
+    - memory_budget_mb aşılınca yükleme durur (o ana kadarki veri kalır)
+    """
+
+    def __init__(self, mode="index", ranking="count", k1=1.5, b=0.75, near_dup=None,
+                 streaming=False, workers=None, memory_budget_mb=None):
         self.documents = []
+        self.index = defaultdict(list)
+        self.term_freqs = defaultdict(list)
+        self.doc_lengths = []
+        # Toplam posting sayısı; ekledikçe güncellenir (memory_usage O(1) kalır)
+        self.n_postings = 0
+        self.mode = mode
+        self.ranking = ranking
 
-    def _clean(self, text: str) -> str:
-        # UTF-8 dışı her şeyi sil
-        text = text.encode("utf-8", errors="ignore").decode("utf-8")
+        # ---- BM25 ----
+        self.k1 = k1
+        self.b = b
+        self._bm25 = None
+        self._vocab = None
 
-        # Kontrol karakterleri
-        text = re.sub(r"[\x00-\x1f\x7f-\x9f]", " ", text)
+        # ---- NEAR-DUP ----
+        self.near_dup = near_dup if NearDuplicateFilter else None
+        self._dedup = NearDuplicateFilter(near_dup) if self.near_dup else None
 
-        # Aşırı sembol temizliği
-        text = re.sub(r"[^\w\sğüşöçıİĞÜŞÖÇ\.\,\-\(\)]", " ", text)
+        # ---- STREAMING ----
+        self.streaming = streaming
+        self.workers = workers
+        self.memory_budget_mb = memory_budget_mb
+        # Bütçe yüzünden eksik yüklendiyse True (snapshot yazılmaz)
+        self.truncated = False
 
-        return text.strip()
+    def _clean(self, text: str) -> str:
+        return clean_text(text)
 
     def _is_valid(self, text: str) -> bool:
-        if len(text) < 30:
+        return is_valid_text(text)
+
+    def _tokenize(self, text: str):
+        return TOKEN_RE.findall(text.lower())
+
+    def _add_document(self, text: str):
+        if isinstance(self.documents, _MappedDocuments) and not hasattr(self.documents, "append"):
+            self._thaw()
+
+        doc_id = len(self.documents)
+        tokens = self._tokenize(text)
+
+        self.documents.append(text)
+        self.doc_lengths.append(len(tokens))
+
+        # Her token için doküman bir kez listelenir (+ terim frekansı)
+        counts = Counter(tokens)
+        for tok, tf in counts.items():
+            self.index[tok].append(doc_id)
+            self.term_freqs[tok].append(tf)
+        self.n_postings += len(counts)
+
+        self._bm25 = None
+        self._vocab = None
+
+    def load_file(self, path: str, streaming=None, verbose=True):
+        """Tek kaynak (CSV / .gz / .zst / .acol / snapshot); (yüklenen, atlanan yakın kopya) döner"""
+        if not storage.exists(path):
+            if verbose:
+                print("❌ KB yok:", path)
+            return None
+
+        path = storage.resolve(path)
+
+        if self.streaming if streaming is None else streaming:
+            return self.load_file_streaming(path, verbose=verbose)
+
+        loaded = 0
+        skipped = 0
+
+        for row in storage.iter_rows(path, kinds=("text",)):
+            for cell in row:
+                clean = self._clean(cell)
+                if self._is_valid(clean):
+                    if self._dedup is not None and self._dedup.seen(clean):
+                        skipped += 1
+                        continue
+                    self._add_document(clean)
+                    loaded += 1
+
+        if verbose:
+            note = f" | {skipped} yakın kopya atlandı" if skipped else ""
+            print(f"✅ {loaded} temiz bilgi yüklendi → {os.path.basename(path)}{note}")
+        return loaded, skipped
+
+    # --------------------------------------------------------
+    # AKIŞLI YÜKLEME (parçalı okuma + süreç havuzu + bellek bütçesi)
+    # --------------------------------------------------------
+    def _compact(self):
+        """Depoyu kompakt yapılara çevirir (arena + array('i'))"""
+        if isinstance(self.documents, DocumentArena):
+            return
+
+        # Liste veya mmap'li snapshot → arena
+        self.documents = DocumentArena(self.documents)
+        self.doc_lengths = array("i", [int(n) for n in self.doc_lengths])
+        self.index = defaultdict(
+            _int_array, {t: array("i", [int(x) for x in v]) for t, v in self.index.items()}
+        )
+        self.term_freqs = defaultdict(
+            _int_array, {t: array("i", [int(x) for x in v]) for t, v in self.term_freqs.items()}
+        )
+
+    def memory_usage(self):
+        """Depo + indeks için yaklaşık bayt (kompakt modda)"""
+        docs = self.documents
+        if isinstance(docs, DocumentArena):
+            doc_bytes = docs.nbytes
+        else:
+            doc_bytes = sum(len(d) + 49 for d in docs)
+
+        # posting başına id + tf (4+4 bayt), terim başına ~2 array + sözlük girdisi
+        return doc_bytes + 4 * len(self.doc_lengths) + 8 * self.n_postings + 220 * len(self.index)
+
+    def load_file_streaming(self, path: str, workers=None, chunk_rows=CHUNK_ROWS,
+                            memory_budget_mb=None, verbose=True):
+        """
+        CSV'yi chunk_rows satırlık parçalar halinde okur; temizlik
+        süreç havuzunda yapılır, sonuçlar okuma sırasıyla eklenir
+        (çıktı tek süreçli yüklemeyle birebir aynıdır).
+
+        Havuzdaki bekleyen parça sayısı sınırlıdır → bellek, dosya
+        boyutundan bağımsız kalır. Bütçe aşılırsa yükleme durur.
+        """
+        if not storage.exists(path):
+            if verbose:
+                print("❌ KB yok:", path)
+            return None
+
+        path = storage.resolve(path)
+
+        workers = workers or self.workers or os.cpu_count() or 1
+        budget_mb = memory_budget_mb or self.memory_budget_mb
+        budget = budget_mb * 1024 * 1024 if budget_mb else None
+
+        self._compact()
+        name = os.path.basename(path)
+        t0 = time.perf_counter()
+        rows = loaded = skipped = 0
+        next_report = PROGRESS_EVERY
+        over_budget = False
+
+        def _ingest(texts):
+            nonlocal loaded, skipped
+            for clean in texts:
+                if self._dedup is not None and self._dedup.seen(clean):
+                    skipped += 1
+                    continue
+                self._add_document(clean)
+                loaded += 1
+
+        def _report():
+            print(
+                f"⏳ {name}: {rows} satır | {loaded} bilgi | "
+                f"{self.memory_usage() / 2**20:.1f} MB | "
+                f"{time.perf_counter() - t0:.1f} sn"
+            )
+
+        pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        pending = deque()
+        chunks = _read_chunks(path, chunk_rows)
+        try:
+            while True:
+                # İşçi başına en fazla 2 parça beklemede
+                while len(pending) < (2 * workers if pool else 1):
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    if pool is None:
+                        pending.append((len(chunk), clean_rows(chunk)))
+                    else:
+                        pending.append((len(chunk), pool.submit(clean_rows, chunk)))
+                if not pending:
+                    break
+
+                n_rows, texts = pending.popleft()
+                _ingest(texts if pool is None else texts.result())
+                rows += n_rows
+
+                if budget and self.memory_usage() > budget:
+                    over_budget = True
+                    break
+                if verbose and rows >= next_report:
+                    next_report += PROGRESS_EVERY
+                    _report()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if over_budget:
+            self.truncated = True
+            print(f"⚠️ Bellek bütçesi ({budget_mb:.1f} MB) doldu, {name} yüklemesi durduruldu")
+
+        if verbose:
+            note = f" | {skipped} yakın kopya atlandı" if skipped else ""
+            print(
+                f"✅ {loaded} temiz bilgi yüklendi → {name}{note} "
+                f"({time.perf_counter() - t0:.1f} sn, {self.memory_usage() / 2**20:.1f} MB)"
+            )
+        return loaded, skipped
+
+    # --------------------------------------------------------
+    # ÇOK DOSYALI PARALEL YÜKLEME
+    # --------------------------------------------------------
+    def _merge(self, part):
+        """Başka bir KB'nin dokümanlarını ve indeksini id kaydırarak ekler"""
+        self._compact()
+        part._compact()
+        base = len(self.documents)
+        shift = len(self.documents.blob)
+
+        def _shifted(values, delta):
+            if np is not None:
+                out = array("i")
+                out.frombytes((np.frombuffer(values, dtype=np.int32) + delta).astype(np.int32).tobytes())
+                return out
+            return array("i", (v + delta for v in values))
+
+        self.documents.blob += part.documents.blob
+        if np is not None:
+            offsets = np.frombuffer(part.documents.offsets, dtype=np.int64)[1:] + shift
+            self.documents.offsets.frombytes(offsets.tobytes())
+        else:
+            self.documents.offsets.extend(o + shift for o in part.documents.offsets[1:])
+
+        self.doc_lengths.extend(part.doc_lengths)
+        for term, ids in part.index.items():
+            self.index[term].extend(_shifted(ids, base))
+            self.term_freqs[term].extend(part.term_freqs[term])
+        self.n_postings += part.n_postings
+        self._bm25 = None
+        self._vocab = None
+
+    def _merge_part(self, part, budget=None):
+        """
+        İşçi sonucunu ekler; (yüklenen, atlanan yakın kopya) döner.
+        Bütçeyi aşacak parça tümden birleştirilmez: sığan ilk dokümanlar
+        tek tek eklenir, kalanı atılır (truncated).
+        """
+        # Arena modunda memory_usage O(1) (doküman başına kontrol ucuz)
+        self._compact()
+        if "texts" in part:
+            texts = part["texts"]
+            self.truncated = self.truncated or part["truncated"]
+        else:
+            kb = part["kb"]
+            self.truncated = self.truncated or kb.truncated
+            if not budget or self.memory_usage() + kb.memory_usage() <= budget:
+                self._merge(kb)
+                return len(kb.documents), 0
+            texts = kb.documents
+
+        loaded = skipped = 0
+        for clean in texts:
+            if budget and self.memory_usage() > budget:
+                self.truncated = True
+                break
+            if self._dedup is not None and self._dedup.seen(clean):
+                skipped += 1
+                continue
+            self._add_document(clean)
+            loaded += 1
+        return loaded, skipped
+
+    def load_files(self, sources, workers=None):
+        """
+        Dosya listesi veya dizin (içindeki *.csv, isim sırasıyla).
+        Her dosya ayrı süreçte temizlenir ve indekslenir; parçalar
+        verilen sırayla birleştirilir → sonuç sıralı yüklemeyle aynıdır.
+
+        near_dup açıksa yakın kopya filtresi dosyalar arası ortak
+        olduğundan süreçler sadece temizler, filtre + indeks ana
+        süreçte sırayla yapılır.
+
+        memory_budget_mb tüm dosyalar için ortaktır: işçiye kalan bütçe
+        verilir, her birleştirmeden sonra yeniden kontrol edilir.
+
+        Dosya başına süre / doküman sayısı tek bir özet olarak yazılır.
+        """
+        paths = resolve_sources(sources)
+        workers = min(workers or self.workers or os.cpu_count() or 1, max(len(paths), 1))
+        texts_only = self._dedup is not None
+        budget = self.memory_budget_mb * 1024 * 1024 if self.memory_budget_mb else None
+        t0 = time.perf_counter()
+        summary = []
+
+        if len(paths) == 1:
+            # Tek dosya: dosya içi (parçalı) paralellik load_file'da
+            start = time.perf_counter()
+            result = self.load_file(paths[0], verbose=False)
+            summary.append((paths[0], result, time.perf_counter() - start))
+        else:
+            pool = ProcessPoolExecutor(workers) if workers > 1 else None
+            queue = iter(paths)
+            pending = deque()
+
+            def _over_budget():
+                return budget and self.memory_usage() >= budget
+
+            def _submit():
+                # En fazla `workers` parça beklemede (tüm parçalar aynı anda
+                # bellekte tutulmaz); her işçi o anda kalan bütçeyi alır
+                path = next(queue, None)
+                if path is None:
+                    return False
+                left_mb = (budget - self.memory_usage()) / 2**20 if budget else None
+                args = (path, texts_only, left_mb)
+                pending.append((path, pool.submit(_load_part, *args) if pool else args))
+                return True
+
+            try:
+                while len(pending) < workers and not _over_budget() and _submit():
+                    pass
+
+                while pending:
+                    path, job = pending.popleft()
+                    part = job.result() if pool else _load_part(*job)
+
+                    if part is None:
+                        summary.append((path, None, 0.0))
+                    elif _over_budget():
+                        self.truncated = True
+                        summary.append((path, "budget", part["seconds"]))
+                    else:
+                        # Dosya süresi = işçi süresi + ana süreçteki birleştirme
+                        start = time.perf_counter()
+                        result = self._merge_part(part, budget)
+                        summary.append((path, result, part["seconds"] + time.perf_counter() - start))
+                    part = None
+
+                    if not _over_budget():
+                        _submit()
+
+                # Bütçe dolduğu için hiç başlatılmayan dosyalar
+                for path in queue:
+                    self.truncated = True
+                    summary.append((path, "budget", 0.0))
+            finally:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+
+        self._print_summary(summary, workers, time.perf_counter() - t0)
+        return summary
+
+    def _print_summary(self, summary, workers, elapsed):
+        print(f"📚 KB yükleme özeti ({len(summary)} dosya, {workers} süreç):")
+        for path, result, seconds in summary:
+            name = os.path.basename(path)
+            if result is None:
+                print(f"   ❌ {name:24s} bulunamadı")
+            elif result == "budget":
+                print(f"   ⚠️ {name:24s} bellek bütçesi doldu, atlandı")
+            else:
+                loaded, skipped = result
+                note = f" | {skipped} yakın kopya" if skipped else ""
+                print(f"   ✅ {name:24s} {loaded:>9d} bilgi  {seconds:6.2f} sn{note}")
+        print(f"   Σ  {'toplam':24s} {len(self.documents):>9d} bilgi  {elapsed:6.2f} sn")
+
+    # --------------------------------------------------------
+    # SNAPSHOT (temizlenmiş dokümanlar + indeks, mmap ile yükleme)
+    # --------------------------------------------------------
+    def load_cached(self, paths, snapshot_path):
+        """
+        paths: dosya listesi veya dizin.
+        Kaynak CSV'ler değişmediyse snapshot'ı mmap ile açar,
+        değiştiyse CSV'leri yeniden yükleyip snapshot'ı yazar.
+        Bellek bütçesi yüklemeyi kestiyse eksik KB snapshot'a yazılmaz
+        (sonraki çalıştırmalar onu tam sanıp tekrar kullanırdı).
+        """
+        paths = resolve_sources(paths)
+        if not self.documents and self.load_snapshot(snapshot_path, paths):
+            return
+
+        self.load_files(paths)
+
+        if self.truncated:
+            print("⚠️ KB bellek bütçesiyle kesildi, snapshot yazılmadı")
+            return
+
+        try:
+            self.save_snapshot(snapshot_path, paths)
+        except (OSError, RuntimeError) as e:
+            print("⚠️ KB snapshot yazılamadı:", e)
+
+    def save_snapshot(self, path, sources=()):
+        if np is None:
+            raise RuntimeError("KB snapshot için numpy gerekli")
+
+        if isinstance(self.documents, DocumentArena):
+            # Arena zaten snapshot düzeninde: kopyasız
+            text = np.frombuffer(self.documents.blob, dtype=np.uint8)
+            doc_offsets = np.frombuffer(self.documents.offsets, dtype=np.int64)
+        else:
+            encoded = [d.encode("utf-8") for d in self.documents]
+            text = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            doc_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(e) for e in encoded], out=doc_offsets[1:])
+
+        terms = list(self.index)
+        post_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(self.index[t]) for t in terms], out=post_offsets[1:])
+
+        def _concat(table):
+            if not terms:
+                return np.zeros(0, dtype=np.int32)
+            return np.concatenate(
+                [np.asarray(table[t], dtype=np.int32) for t in terms]
+            )
+
+        sections = {
+            "text": text,
+            "doc_offsets": doc_offsets,
+            "doc_lengths": np.asarray(self.doc_lengths, dtype=np.int32),
+            "terms": np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8),
+            "post_offsets": post_offsets,
+            "post_ids": _concat(self.index),
+            "post_tf": _concat(self.term_freqs),
+        }
+
+        header = {
+            "version": SNAPSHOT_VERSION,
+            "near_dup": self.near_dup,
+            "sources": [_fingerprint(p) for p in sources],
+            "sections": {},
+        }
+
+        # Bölümler 8 bayta hizalanır (np.frombuffer için)
+        offset = 0
+        for name, arr in sections.items():
+            header["sections"][name] = [offset, int(arr.size), arr.dtype.str]
+            offset += (arr.nbytes + 7) // 8 * 8
+
+        head = json.dumps(header).encode("utf-8")
+        head += b" " * (-(len(SNAPSHOT_MAGIC) + 8 + len(head)) % 8)
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack("<Q", len(head)))
+            f.write(head)
+            for arr in sections.values():
+                data = arr.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))
+        os.replace(tmp, path)
+
+    def load_snapshot(self, path, sources=None):
+        """
+        Snapshot geçerliyse True döner. sources verilirse kayıtlı
+        kaynak parmak izleriyle karşılaştırılır.
+        """
+        snap = read_snapshot(path)
+        if snap is None:
             return False
-        if any(x in text.lower() for x in ["http", "www", ".png", ".jpg"]):
+        header, arrays = snap
+
+        if header.get("near_dup") != self.near_dup:
             return False
+        if sources is not None:
+            saved = header["sources"]
+            wanted = [os.path.abspath(p) for p in sources]
+            if [s["path"] for s in saved] != wanted:
+                return False
+            if not all(_source_unchanged(s) for s in saved):
+                return False
+
+        terms = bytes(arrays["terms"]).decode("utf-8")
+        terms = terms.split("\n") if terms else []
+        term_ids = {t: i for i, t in enumerate(terms)}
+
+        self.documents = _MappedDocuments(arrays["text"], arrays["doc_offsets"])
+        self.doc_lengths = arrays["doc_lengths"]
+        self.index = _MappedPostings(term_ids, arrays["post_offsets"], arrays["post_ids"])
+        self.term_freqs = _MappedPostings(term_ids, arrays["post_offsets"], arrays["post_tf"])
+        self.n_postings = len(arrays["post_ids"])
+        self._bm25 = None
+        self._vocab = None
+
+        print(f"✅ {len(self.documents)} bilgi snapshot'tan yüklendi → {os.path.basename(path)}")
         return True
 
-    def load_file(self, path: str):
-        if not os.path.exists(path):
-            print("❌ KB yok:", path)
-            return
+    def _thaw(self):
+        # mmap'li snapshot üzerine yeni doküman eklenecekse düz listelere dön
+        self.documents = list(self.documents)
+        self.doc_lengths = [int(n) for n in self.doc_lengths]
+        self.index = defaultdict(list, {t: v.tolist() for t, v in self.index.items()})
+        self.term_freqs = defaultdict(list, {t: v.tolist() for t, v in self.term_freqs.items()})
 
-        loaded = 0
+    def search(self, query: str, top_k: int = 3, mode=None, ranking=None):
+        mode = mode or self.mode
+        ranking = ranking or self.ranking
+        if mode == "legacy":
+            return self._search_legacy(query, top_k)
+        if mode != "index":
+            raise ValueError(f"Bilinmeyen arama modu: {mode}")
+        if ranking == "bm25":
+            return self._search_bm25(query, top_k)
+        if ranking != "count":
+            raise ValueError(f"Bilinmeyen sıralama: {ranking}")
+
+        # Skor: sorgu kelimesiyle başlayan terimi bulunan doküman başına +1
+        # (her kelime bir kez sayılır)
+        scores = Counter()
+        for w in self._tokenize(query):
+            terms = self._expand(w)
+            if len(terms) == 1:
+                matched = self.index[terms[0]]
+            else:
+                matched = set()
+                for term in terms:
+                    matched.update(self.index[term])
+            for doc_id in matched:
+                scores[doc_id] += 1
+
+        # Eşit skorda yükleme sırası korunur
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return [self.documents[i] for i, _ in ranked[:top_k]]
+
+    # --------------------------------------------------------
+    # TERİM SÖZLÜĞÜ
+    # --------------------------------------------------------
+    def _expand(self, word):
+        """
+        Sorgu kelimesiyle başlayan indeks terimleri ("mesafe" → mesafe,
+        mesafesi, mesafeler, ...): Türkçe ekler sona geldiğinden çekimli
+        biçimler yakalanır. Sıralı terim listesinde bisect ile bulunur.
+        MIN_PREFIX_LEN'den kısa kelimeler ("a", "ne", "mi") sadece birebir
+        eşleşir; aksi halde neredeyse her terime genişleyip indeksi boşa
+        çıkarırlardı. Tam alt-dize araması legacy modda kalır.
+        """
+        if len(word) < MIN_PREFIX_LEN:
+            return [word] if word in self.index else []
+
+        if self._vocab is None:
+            self._vocab = {"terms": sorted(self.index), "cache": {}}
+        vocab = self._vocab
+
+        cached = vocab["cache"].get(word)
+        if cached is not None:
+            return cached
+
+        terms = vocab["terms"]
+        found = []
+        for i in range(bisect_left(terms, word), len(terms)):
+            if not terms[i].startswith(word):
+                break
+            found.append(terms[i])
+
+        if len(vocab["cache"]) >= 4096:
+            vocab["cache"].clear()
+        vocab["cache"][word] = found
+        return found
+
+    # --------------------------------------------------------
+    # BM25
+    # --------------------------------------------------------
+    def _bm25_stats(self):
+        """
+        Doküman uzunlukları ve IDF değerleri NumPy dizilerinde tutulur;
+        yeni doküman eklenince bir sonraki aramada yeniden hesaplanır.
+        """
+        if self._bm25 is not None:
+            return self._bm25
+
+        if np is None:
+            raise RuntimeError("BM25 için numpy gerekli")
+
+        terms = list(self.index)
+        n_docs = len(self.documents)
+        df = np.fromiter(
+            (len(self.index[t]) for t in terms), dtype=np.float32, count=len(terms)
+        )
+        idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+
+        doc_len = np.asarray(self.doc_lengths, dtype=np.float32)
+        avgdl = float(doc_len.mean()) if n_docs else 0.0
+
+        self._bm25 = {
+            "term_ids": {t: i for i, t in enumerate(terms)},
+            "idf": idf,
+            "norm": self.k1 * (1.0 - self.b + self.b * doc_len / max(avgdl, 1e-9)),
+            "postings": {},
+        }
+        return self._bm25
+
+    def _postings(self, stats, term):
+        cached = stats["postings"].get(term)
+        if cached is None:
+            cached = (
+                np.asarray(self.index[term], dtype=np.int64),
+                np.asarray(self.term_freqs[term], dtype=np.float32),
+            )
+            stats["postings"][term] = cached
+        return cached
+
+    def _search_bm25(self, query: str, top_k: int = 3):
+        stats = self._bm25_stats()
+
+        ids, weights = [], []
+        for w in self._tokenize(query):
+            word_ids, word_weights = [], []
+            for term in self._expand(w):
+                doc_ids, tf = self._postings(stats, term)
+                word_ids.append(doc_ids)
+                word_weights.append(
+                    stats["idf"][stats["term_ids"][term]] * tf * (self.k1 + 1.0)
+                    / (tf + stats["norm"][doc_ids])
+                )
+            if not word_ids:
+                continue
+            if len(word_ids) == 1:
+                ids.append(word_ids[0])
+                weights.append(word_weights[0])
+                continue
+
+            # Birden çok terim eşleşirse doküman başına en yüksek ağırlık alınır
+            # (bir sorgu kelimesi bir dokümana bir kez katkı verir)
+            doc_ids = np.concatenate(word_ids)
+            word_weight = np.concatenate(word_weights)
+            order = np.lexsort((-word_weight, doc_ids))
+            doc_ids, word_weight = doc_ids[order], word_weight[order]
+            first = np.ones(len(doc_ids), dtype=bool)
+            first[1:] = doc_ids[1:] != doc_ids[:-1]
+            ids.append(doc_ids[first])
+            weights.append(word_weight[first])
+
+        if not ids:
+            return []
+
+        # Aday dokümanların skorları tek geçişte toplanır
+        candidates, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(weights))
 
-        with open(path, encoding="utf-8", errors="ignore") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                for cell in row:
-                    clean = self._clean(cell)
-                    if self._is_valid(clean):
-                        self.documents.append(clean)
-                        loaded += 1
+        # Tam sıralama yerine sadece top-k seçilir
+        k = min(top_k, len(candidates))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((candidates[top], -scores[top]))]
 
-        print(f"✅ {loaded} temiz bilgi yüklendi → {os.path.basename(path)}")
+        return [self.documents[int(candidates[i])] for i in top]
 
-    def search(self, query: str, top_k: int = 3):
+    def _search_legacy(self, query: str, top_k: int = 3):
         q = query.lower().split()
         scored = []
 
@@ -58,4 +975,4 @@ class KnowledgeBase:
                 scored.append((score, doc))
 
         scored.sort(key=lambda x: x[0], reverse=True)
-        return [d for _, d in scored[:top_k]]
\ No newline at end of file
+        return [d for _, d in scored[:top_k]]
@@ -0,0 +1,155 @@
+# ============================================================
+# live_engine.py – HEADLESS LIVE SIMULATION ENGINE
+# Arka plan thread | Ayarlanabilir tick hızı | Abone (subscriber) yayını
+# ============================================================
+
+import json
+import threading
+import time
+from collections import deque
+
+
+class LiveSimulation:
+    """
+    tick_fn her tick'te çağrılır ve bir snapshot döner (ör. AsteroidBatch).
+    Snapshot, (tick, snapshot) olarak tüm abonelere yayınlanır.
+
+    interval: tick'ler arası saniye; 0 / None → olabildiğince hızlı
+    lock    : tick_fn bu kilit altında çalışır; REPL aynı kilidi alarak
+              canlı durum üzerinde tutarlı okuma yapabilir
+    """
+
+    def __init__(self, tick_fn, interval=3.0):
+        self.tick_fn = tick_fn
+        self.interval = interval
+        self.subscribers = []
+        self.lock = threading.RLock()
+
+        self.ticks = 0
+        self.errors = 0
+        self._started_at = None
+        self._busy = 0.0
+
+        self._thread = None
+        self._stop = threading.Event()
+
+    # --------------------------------------------------------
+    # ABONELER
+    # --------------------------------------------------------
+    def subscribe(self, fn):
+        self.subscribers.append(fn)
+        return fn
+
+    def unsubscribe(self, fn):
+        if fn in self.subscribers:
+            self.subscribers.remove(fn)
+
+    def _publish(self, tick, snapshot):
+        for fn in list(self.subscribers):
+            try:
+                fn(tick, snapshot)
+            except Exception:
+                # Hatalı abone simülasyonu durdurmaz
+                self.errors += 1
+
+    # --------------------------------------------------------
+    # TICK
+    # --------------------------------------------------------
+    def step(self):
+        t0 = time.perf_counter()
+        with self.lock:
+            snapshot = self.tick_fn()
+            self.ticks += 1
+            tick = self.ticks
+        self._publish(tick, snapshot)
+        self._busy += time.perf_counter() - t0
+        return snapshot
+
+    def run(self, n_ticks):
+        """Senkron, beklemesiz n tick (benchmark için)"""
+        self._started_at = self._started_at or time.perf_counter()
+        for _ in range(n_ticks):
+            self.step()
+        return self.stats()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            self.step()
+            if self.interval:
+                self._stop.wait(max(0.0, self.interval - (time.perf_counter() - t0)))
+
+    # --------------------------------------------------------
+    # BAŞLAT / DURDUR
+    # --------------------------------------------------------
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name="astrollm-live", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "ticks": self.ticks,
+            "errors": self.errors,
+            "elapsed": round(elapsed, 3),
+            "ticks_per_sec": round(self.ticks / elapsed, 2) if elapsed else 0.0,
+            "busy_per_tick_ms": round(1000 * self._busy / self.ticks, 3) if self.ticks else 0.0,
+        }
+
+
+# ============================================================
+# HAZIR ABONELER
+# ============================================================
+
+class FileSink:
+    """Her tick için tek satır JSON özet (jsonl)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "a", encoding="utf-8")
+
+    def __call__(self, tick, asteroids):
+        if hasattr(asteroids, "most_risky"):
+            risky = asteroids.most_risky()
+        else:
+            risky = max(asteroids, key=lambda a: a["risk"], default=None)
+        self._f.write(json.dumps({
+            "tick": tick,
+            "time": time.time(),
+            "count": len(asteroids),
+            "max_risk": risky["risk"] if risky else None,
+            "most_risky": risky["name"] if risky else None,
+        }, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class MetricsSink:
+    """Son tick'ler üzerinden anlık tick/sn"""
+
+    def __init__(self, window=20):
+        self.times = deque(maxlen=window)
+
+    def __call__(self, tick, asteroids):
+        self.times.append(time.perf_counter())
+
+    def ticks_per_sec(self):
+        if len(self.times) < 2:
+            return 0.0
+        return (len(self.times) - 1) / (self.times[-1] - self.times[0])
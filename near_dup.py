@@ -0,0 +1,154 @@
+# ============================================================
+# near_dup.py – SIMHASH NEAR-DUPLICATE FILTER
+# 64-bit SimHash | Bant / bit örneklemeli LSH | Ayarlanabilir benzerlik eşiği
+# ============================================================
+
+import hashlib
+import math
+import re
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+BITS = 64
+
+BAND_BITS = 16       # tablo anahtarı genişliği (2^16 kova)
+MAX_TABLES = 32      # örneklemeli modda en fazla tablo
+TARGET_RECALL = 0.95
+MIN_RECALL = 0.25    # bunun altında filtre fiilen kapalıdır → ValueError
+
+# Python 3.10+ int.bit_count, eski sürümlerde bin().count
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+
+def _features(text):
+    tokens = TOKEN_RE.findall(text.lower())
+    # Kelime + ikili kelime: sıra değişikliklerine karşı hassas
+    return tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+
+
+def simhash(text):
+    """64-bit SimHash (int)"""
+    feats = _features(text)
+    if not feats:
+        return 0
+
+    digests = b"".join(
+        hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest() for f in feats
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, BITS)
+
+    # Bit başına çoğunluk oyu
+    votes = bits.sum(axis=0) * 2 > len(feats)
+    return int.from_bytes(np.packbits(votes).tobytes(), "big")
+
+
+class NearDuplicateFilter:
+    """
+    threshold: 0–1 arası benzerlik (1 - hamming / 64).
+
+    Aday araması tablolarla yapılır; her tablo anahtarı en az band_bits
+    bitliktir, böylece kovalar küçük kalır ve seen() korpus büyüdükçe
+    yavaşlamaz:
+
+    - max_distance + 1 bant band_bits'e sığıyorsa (varsayılanla k <= 3):
+      ardışık bantlar; hamming <= k olan iki hash en az bir bantta birebir
+      aynıdır (güvercin yuvası) → kesin sonuç.
+    - Daha geniş eşiklerde: her tablo 64 bitten sabit tohumla seçilmiş
+      band_bits biti örnekler. Tablo sayısı, tam max_distance'taki çiftlerin
+      ~%95'i bulunacak şekilde seçilir (max_tables ile sınırlı); daha yakın
+      kopyalar çok daha yüksek oranla yakalanır. self.recall bu sınırdaki
+      tahmini bulma oranıdır (ör. 0.8 → k=13, 32 tablo: ~%38; k=6'da ~%99).
+
+    Bulma oranı MIN_RECALL'ın altına düşecek eşikler (varsayılan band_bits
+    ile ~0.78'in altı) ValueError verir: filtre açık görünüp hiçbir şey
+    yakalamazdı.
+
+    Yanlış pozitif: kısa metinlerin SimHash'leri ilgisiz olsalar da birkaç
+    bit yakın olabilir; bu yüzden >= 0.9 önerilir (bulma oranının ~%95'e
+    ulaştığı tek aralık).
+    """
+
+    def __init__(self, threshold=0.9, band_bits=BAND_BITS, max_tables=MAX_TABLES):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"near_dup eşiği 0–1 arasında olmalı: {threshold}")
+        if not 1 <= band_bits <= BITS:
+            raise ValueError(f"band_bits 1–{BITS} arasında olmalı: {band_bits}")
+        self.threshold = threshold
+        self.max_distance = max(0, int(round((1.0 - threshold) * BITS)))
+        k = self.max_distance
+
+        if BITS // (k + 1) >= band_bits:
+            # Kesin mod: ardışık k+1 bant
+            edges = np.linspace(0, BITS, k + 2).astype(int)
+            self.bands = [(int(a), (1 << int(b - a)) - 1) for a, b in zip(edges[:-1], edges[1:])]
+            self.samples = None
+            self.recall = 1.0
+        else:
+            # Örneklemeli mod: tablo başına band_bits rastgele bit
+            p = math.comb(BITS - k, band_bits) / math.comb(BITS, band_bits)
+            if p >= 1.0:
+                n_tables = 1
+            elif p > 0.0:
+                n_tables = math.ceil(math.log(1.0 - TARGET_RECALL) / math.log(1.0 - p))
+            n_tables = max(1, min(n_tables, max_tables)) if p > 0.0 else 0
+            recall = 1.0 - (1.0 - p) ** n_tables
+
+            # Çok düşük eşikte hiçbir tablo yakın çifti yakalayamaz
+            if recall < MIN_RECALL:
+                raise ValueError(
+                    f"near_dup eşiği {threshold} desteklenmiyor: tahmini bulma oranı "
+                    f"{recall:.2g} (< {MIN_RECALL}); daha yüksek eşik veya daha dar band_bits kullanın"
+                )
+
+            rng = np.random.default_rng(BITS * 1000 + band_bits)
+            self.bands = None
+            self.samples = np.stack([
+                rng.choice(BITS, band_bits, replace=False) for _ in range(n_tables)
+            ])
+            self._weights = (1 << np.arange(band_bits, dtype=np.int64))
+            self.recall = recall
+
+        n_tables = len(self.bands) if self.bands is not None else len(self.samples)
+        self.tables = [dict() for _ in range(n_tables)]
+        self.hashes = []
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def _keys(self, h):
+        if self.bands is not None:
+            return [(h >> shift) & mask for shift, mask in self.bands]
+        bits = np.unpackbits(np.frombuffer(h.to_bytes(8, "big"), dtype=np.uint8))
+        return (bits[self.samples] @ self._weights).tolist()
+
+    def _match(self, h, keys):
+        hashes = self.hashes
+        limit = self.max_distance
+        for table, key in zip(self.tables, keys):
+            for idx in table.get(key, ()):
+                if _popcount(h ^ hashes[idx]) <= limit:
+                    return idx
+        return None
+
+    def find(self, text):
+        """Yakın kopya varsa onun sırası, yoksa None"""
+        h = simhash(text)
+        return self._match(h, self._keys(h))
+
+    def seen(self, text):
+        """
+        Metin daha önce görülen bir metnin yakın kopyasıysa True;
+        değilse kaydeder ve False döner.
+        """
+        h = simhash(text)
+        keys = self._keys(h)
+
+        if self._match(h, keys) is not None:
+            return True
+
+        idx = len(self.hashes)
+        self.hashes.append(h)
+        for table, key in zip(self.tables, keys):
+            table.setdefault(key, []).append(idx)
+        return False
@@ -0,0 +1,200 @@
+# ============================================================
+# storage.py – DATASET STORAGE BACKENDS
+# Düz CSV | gzip / zstd CSV | columnar (.acol) | KB snapshot (salt okuma)
+# ============================================================
+
+import csv
+import gzip
+import io
+import os
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+CSV_SUFFIXES = (".csv",) + tuple(".csv" + s for s in COMPRESSED_SUFFIXES)
+COLUMNAR_SUFFIX = ".acol"
+
+
+def resolve(path):
+    """
+    Var olan yol; yoksa sıkıştırılmış / columnar kardeşi
+    (astronomy.csv → astronomy.csv.gz / .zst / astronomy.acol).
+    Hiçbiri yoksa None.
+    """
+    if os.path.exists(path):
+        return path
+    for suffix in COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            return path + suffix
+    if path.endswith(".csv") and os.path.exists(path[:-4] + COLUMNAR_SUFFIX):
+        return path[:-4] + COLUMNAR_SUFFIX
+    return None
+
+
+def exists(path):
+    return resolve(path) is not None
+
+
+def is_dataset(name):
+    """Dizin taramasında veri dosyası sayılan isimler (CSV biçimleri + .acol)"""
+    return name.lower().endswith(CSV_SUFFIXES + (COLUMNAR_SUFFIX,))
+
+
+# Aynı veri birden çok biçimde durursa tercih sırası (resolve ile aynı)
+FORMAT_PREFERENCE = CSV_SUFFIXES + (COLUMNAR_SUFFIX,)
+
+
+def dataset_stem(name):
+    """astronomy.csv.gz / astronomy.acol → ("astronomy", biçim sırası); veri değilse None"""
+    lower = name.lower()
+    for rank, suffix in enumerate(FORMAT_PREFERENCE):
+        if lower.endswith(suffix):
+            return name[: -len(suffix)], rank
+    return None
+
+
+def detect_format(path):
+    """Biçim: csv | gzip | zstd | columnar | snapshot"""
+    lower = path.lower()
+    if lower.endswith(".gz"):
+        return "gzip"
+    if lower.endswith(".zst"):
+        return "zstd"
+
+    from columnar import MAGIC as COLUMNAR_MAGIC
+    from knowledge_base import SNAPSHOT_MAGIC
+
+    with open(path, "rb") as f:
+        head = f.read(max(len(SNAPSHOT_MAGIC), len(COLUMNAR_MAGIC)))
+    if head.startswith(SNAPSHOT_MAGIC):
+        return "snapshot"
+    if head.startswith(COLUMNAR_MAGIC):
+        return "columnar"
+    return "csv"
+
+
+# ============================================================
+# OKUMA / YAZMA
+# ============================================================
+
+def _zstd():
+    if zstandard is None:
+        raise RuntimeError("zstd için 'zstandard' paketi gerekli (pip install zstandard)")
+    return zstandard
+
+
+def open_text(path, mode="r"):
+    """
+    Biçime göre metin akışı (UTF-8). Okumada bozuk baytlar atlanır;
+    yazmada uzantıya göre sıkıştırılır.
+    """
+    writing = "w" in mode or "a" in mode
+    fmt = detect_format(path) if not writing else (
+        "gzip" if path.lower().endswith(".gz")
+        else "zstd" if path.lower().endswith(".zst") else "csv"
+    )
+    errors = "strict" if writing else "ignore"
+
+    if fmt == "gzip":
+        return gzip.open(path, mode.replace("b", "") + "t",
+                         encoding="utf-8", errors=errors, newline="")
+    if fmt == "zstd":
+        zstd = _zstd()
+        raw = open(path, "wb" if writing else "rb")
+        stream = (
+            zstd.ZstdCompressor().stream_writer(raw) if writing
+            else zstd.ZstdDecompressor().stream_reader(raw)
+        )
+        return io.TextIOWrapper(stream, encoding="utf-8", errors=errors, newline="")
+    if fmt in ("snapshot", "columnar"):
+        raise ValueError(f"{fmt} dosyası metin olarak açılamaz, iter_rows kullanın: {path}")
+    return open(path, mode, encoding="utf-8", errors=errors, newline="")
+
+
+def iter_rows(path, kinds=None):
+    """
+    Satır akışı (str hücreler). CSV biçimleri csv.reader ile okunur;
+    KB snapshot'ında her doküman tek hücreli bir satırdır.
+
+    kinds: columnar dosyada sadece bu türdeki sütunlar okunur
+    (ör. ("text",) → topic / id hiç açılmaz). Tür bilgisi olmayan
+    biçimlerde yok sayılır.
+    """
+    fmt = detect_format(path)
+    if fmt == "columnar":
+        for rows in iter_row_chunks(path, kinds=kinds):
+            yield from rows
+        return
+
+    if fmt == "snapshot":
+        from knowledge_base import read_snapshot_documents
+
+        for doc in read_snapshot_documents(path):
+            yield [doc]
+        return
+
+    with open_text(path) as f:
+        yield from csv.reader(f)
+
+
+def iter_row_chunks(path, chunk_rows=None, kinds=None):
+    """
+    Satırları liste parçaları halinde verir. Columnar dosyada parçalar
+    doğrudan bloklardan kesilir (satır başına Python adımı yok);
+    chunk_rows=None → blok boyu.
+    """
+    if detect_format(path) == "columnar":
+        from columnar import ColumnarReader
+
+        reader = ColumnarReader(path)
+        columns = None
+        if kinds is not None:
+            columns = [c for c in reader.columns if reader.kinds[c] in kinds]
+        for rows in reader.iter_row_blocks(columns, as_str=True):
+            step = chunk_rows or len(rows) or 1
+            for i in range(0, len(rows), step):
+                yield rows[i:i + step]
+        return
+
+    chunk = []
+    for row in iter_rows(path, kinds):
+        chunk.append(row)
+        if chunk_rows and len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ============================================================
+# I/O BENCHMARK (biçim başına okuma maliyeti)
+#   python storage.py astronomy.csv astronomy.csv.gz kb.snapshot
+# ============================================================
+if __name__ == "__main__":
+    import sys
+    import time
+
+    for path in sys.argv[1:]:
+        if path.startswith("--"):
+            continue
+        resolved = resolve(path)
+        if resolved is None:
+            print(f"❌ {path} bulunamadı")
+            continue
+
+        t0 = time.perf_counter()
+        rows = cells = 0
+        for row in iter_rows(resolved):
+            rows += 1
+            cells += len(row)
+        elapsed = time.perf_counter() - t0
+
+        size = os.path.getsize(resolved) / 2**20
+        print(
+            f"{os.path.basename(resolved):28s} {detect_format(resolved):8s} "
+            f"{size:8.1f} MB  {rows:>10d} satır  {elapsed:6.2f} sn  "
+            f"{rows / max(elapsed, 1e-9):10.0f} satır/sn"
+        )
@@ -0,0 +1,176 @@
+# ============================================================
+# text_rewriter.py – COMPILED SINGLE-PASS TEXT REWRITER
+# Tek regex | En uzun eşleşme önceliği | Kural dosyası desteği
+# ============================================================
+
+import re
+
+
+def _trie_regex(node):
+    """
+    Trie → regex. Ortak önekler tek dalda toplanır; Python'un re motoru
+    her konumda yüzlerce alternatifi tek tek denemez. Sonlanan düğümde
+    devam kısmı açgözlü (?:...)? olduğundan en uzun eşleşme kazanır.
+    """
+    alts, leaves = [], []
+    for ch in sorted(k for k in node if k):
+        child = node[ch]
+        if len(child) == 1 and "" in child:
+            leaves.append(re.escape(ch))
+        else:
+            alts.append(re.escape(ch) + _trie_regex(child))
+
+    if leaves:
+        alts.append(leaves[0] if len(leaves) == 1 else "[" + "".join(leaves) + "]")
+
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+
+def keyword_regex(words):
+    """
+    Kelime listesi → derlenmiş tek trie regex (boşsa None).
+    Arama maliyeti kelime sayısıyla doğrusal büyümez.
+    """
+    trie = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return re.compile(_trie_regex(trie)) if trie else None
+
+
+class TextRewriter:
+    """
+    kaynak → hedef kurallarını tek bir alternation regex'e derler
+    ve metni tek geçişte dönüştürür.
+
+    Aynı konumda birden çok kural eşleşirse en uzun kaynak kazanır
+    (kaynaklar bir trie regex'ine derlenir).
+    """
+
+    def __init__(self, rules=None):
+        self.rules = {}
+        self._pattern = None
+        self._repl = None
+        if rules:
+            self.extend(rules)
+
+    def extend(self, rules):
+        self.rules.update(rules)
+        self._compile()
+        return self
+
+    def _compile(self):
+        keys = [k for k in self.rules if k]
+        self._pattern = keyword_regex(keys)
+
+        # Tüm hedefler aynıysa (ör. silme) eşleşme başına Python çağrısı yok
+        targets = {self.rules[k] for k in keys}
+        if len(targets) == 1:
+            self._repl = targets.pop().replace("\\", "\\\\")
+        else:
+            rules = self.rules
+            self._repl = lambda m: rules[m[0]]
+
+    def __call__(self, text: str) -> str:
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(self._repl, text)
+
+    # --------------------------------------------------------
+    # KURAL DOSYASI
+    # --------------------------------------------------------
+    @staticmethod
+    def parse_rules(lines):
+        """
+        Satır formatı:  kaynak => hedef
+        '#' ile başlayan satırlar yorumdur; boş hedef = silme
+        """
+        rules = {}
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            if "=>" not in line:
+                raise ValueError(f"Geçersiz kural satırı: {line!r}")
+            src, dst = line.split("=>", 1)
+            rules[src.strip()] = dst.strip()
+        return rules
+
+    def load_file(self, path):
+        with open(path, encoding="utf-8") as f:
+            return self.extend(self.parse_rules(f))
+
+    @classmethod
+    def from_file(cls, path):
+        return cls().load_file(path)
+
+
+# ============================================================
+# MICRO BENCHMARK (eski zincirleme .replace ile karşılaştırma)
+# ============================================================
+if __name__ == "__main__":
+    import timeit
+
+    from astrollmmodule import normalize_sentence, simple_paraphrase
+
+    def legacy_normalize(s):
+        return (
+            s.lower()
+            .replace(",", "")
+            .replace(".", "")
+            .replace("potansiyel", "")
+            .replace("oluşturmaktadır", "")
+            .strip()
+        )
+
+    def legacy_paraphrase(sentence):
+        replacements = {
+            "potansiyel tehdit oluşturmaktadır": "risk faktörü olarak değerlendirilmektedir",
+            "analizlerde": "incelemelerde",
+            "sebebiyle": "nedeniyle",
+            "bu durum": "bu etki",
+            "oluşturmaktadır": "göstermektedir"
+        }
+        for k, v in replacements.items():
+            sentence = sentence.replace(k, v)
+        return sentence
+
+    # Büyük kural seti: kural başına bir .replace taraması vs tek geçiş
+    big_rules = {f"terim{i:04d}": f"karşılık{i:04d}" for i in range(500)}
+    big_rules["analizlerde"] = "incelemelerde"
+    big_rewriter = TextRewriter(big_rules)
+
+    def legacy_big(sentence):
+        for k, v in big_rules.items():
+            sentence = sentence.replace(k, v)
+        return sentence
+
+    sentence = (
+        "Mars üzerinde yapılan analizlerde manyetik alan değişimleri sebebiyle, "
+        "bu durum potansiyel tehdit oluşturmaktadır. "
+    )
+
+    for label, doc in (("kısa", sentence), ("uzun", sentence * 40)):
+        assert legacy_normalize(doc) == normalize_sentence(doc)
+        assert legacy_paraphrase(doc) == simple_paraphrase(doc)
+        assert legacy_big(doc) == big_rewriter(doc)
+
+        n = 2000
+        for name, old, new in (
+            ("normalize_sentence", legacy_normalize, normalize_sentence),
+            ("simple_paraphrase", legacy_paraphrase, simple_paraphrase),
+            ("500 kural", legacy_big, big_rewriter),
+        ):
+            t_old = timeit.timeit(lambda: old(doc), number=n)
+            t_new = timeit.timeit(lambda: new(doc), number=n)
+            print(
+                f"[{label}] {name:20s} eski {t_old * 1e6 / n:8.1f} µs"
+                f" | yeni {t_new * 1e6 / n:8.1f} µs"
+            )
@@ -0,0 +1,260 @@
+# ============================================================
+# train_builder.py – STREAMING TRAIN SET WRITER
+# Hash ile tekilleştirme (set / Bloom) | Intent başına üst sınır / dengeleme
+# Hash tabanlı deterministik train / validation ayrımı
+# ============================================================
+
+import csv
+import hashlib
+import heapq
+import math
+import os
+import re
+from array import array
+from collections import Counter
+
+import storage
+
+SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Tekilleştirme anahtarı: küçük harf + tek boşluk"""
+    return SPACE_RE.sub(" ", text.lower()).strip()
+
+
+def text_hash(text, salt=b""):
+    """Metin → 64-bit int (süreçten / PYTHONHASHSEED'den bağımsız)"""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8, salt=salt).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ============================================================
+# GÖRÜLDÜ FİLTRELERİ
+# ============================================================
+
+class HashSet:
+    """Kesin tekilleştirme: 64-bit hash kümesi (girdi başına ~70 bayt)"""
+
+    def __init__(self):
+        self.hashes = set()
+
+    def add(self, h):
+        """Yeni ise True"""
+        if h in self.hashes:
+            return False
+        self.hashes.add(h)
+        return True
+
+    @property
+    def nbytes(self):
+        return 70 * len(self.hashes)
+
+
+class BloomFilter:
+    """
+    Sabit bellekli yaklaşık küme. Yanlış pozitif oranı ~error_rate
+    (capacity aşılana kadar); yanlış pozitif = nadiren atlanan benzersiz satır.
+    """
+
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        self.m = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _positions(self, h):
+        # Çift hash: h1 + i*h2 (Kirsch–Mitzenmacher)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def add(self, h):
+        """Yeni ise (veya öyle görünüyorsa) True"""
+        new = False
+        bits = self.bits
+        for p in self._positions(h):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        return new
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+# ============================================================
+# WRITER
+# ============================================================
+
+def validation_path(path):
+    """train.csv(.gz) → train.val.csv(.gz)"""
+    for suffix in (".csv.gz", ".csv.zst", ".csv"):
+        if path.endswith(suffix):
+            return path[: -len(suffix)] + ".val" + suffix
+    return path + ".val"
+
+
+class TrainSetWriter:
+    """
+    (text, intent) satırlarını akış halinde yazar.
+
+    dedup          : "set" (kesin) | "bloom" (sabit bellek) | None.
+                     Anahtar (metin, intent): aynı soru farklı intent'le
+                     gelirse atılmaz, etiket çakışması olarak sayılır
+    max_per_intent : intent başına en fazla satır (train + val), None = sınırsız
+    balance        : True → her intent en küçük intent'in satır sayısına indirilir
+    val_ratio      : metnin hash'ine göre validation'a giden oran; aynı metin
+                     her çalıştırmada aynı tarafa düşer (sıra / seed bağımsız)
+
+    Sınır / dengeleme varsa satırlar önce geçici dosyaya yazılır; bellekte
+    sadece satır başına 8 baytlık örnekleme hash'i tutulur. close()'da her
+    intent için en küçük hash'li k satır seçilir: ilk gelenler değil, akışın
+    tamamından sıradan bağımsız düzgün bir örnek. Çıktı geliş sırasını korur.
+    """
+
+    def __init__(self, path, val_ratio=0.1, val_path=None, dedup="set",
+                 max_per_intent=None, balance=True, bloom_capacity=10_000_000,
+                 bloom_error=0.001):
+        self.path = path
+        self.val_ratio = val_ratio
+        self.val_path = val_path or validation_path(path)
+        self.max_per_intent = max_per_intent
+        self.balance = balance
+
+        if dedup == "bloom":
+            self.seen = BloomFilter(bloom_capacity, bloom_error)
+            self.seen_text = BloomFilter(bloom_capacity, bloom_error)
+        elif dedup == "set":
+            self.seen = HashSet()
+            self.seen_text = HashSet()
+        elif dedup is None:
+            self.seen = self.seen_text = None
+        else:
+            raise ValueError(f"Bilinmeyen dedup: {dedup}")
+
+        self.counts = Counter()
+        self.val_counts = Counter()
+        self.duplicates = 0
+        self.conflicts = 0
+        self.capped = 0
+
+        self._files = []
+        self._train = self._open(path)
+        self._val = self._open(self.val_path) if val_ratio > 0 else None
+
+        # Örnekleme modu: satırlar geçici dosyada, intent başına hash dizisi
+        self._sampled = balance or max_per_intent is not None
+        self._spill_path = path + ".spill.tmp"
+        self._spill = None
+        self._sample_hashes = {}
+        if self._sampled:
+            self._spill_file = open(self._spill_path, "w", encoding="utf-8", newline="")
+            self._spill = csv.writer(self._spill_file)
+
+    def _open(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        f = storage.open_text(path, "w")
+        self._files.append(f)
+        writer = csv.writer(f)
+        writer.writerow(["text", "intent"])
+        return writer
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, text, intent):
+        """
+        Tekrarsa "dup"; doğrudan yazıldıysa "train" / "val";
+        örnekleme modunda seçim close()'a kalır → "pending"
+        """
+        key = normalize(text)
+
+        if self.seen is not None:
+            if not self.seen.add(text_hash(key + "\0" + intent)):
+                self.duplicates += 1
+                return "dup"
+            # Yeni (metin, intent) ama metin daha önce başka intent'le geldi
+            if not self.seen_text.add(text_hash(key)):
+                self.conflicts += 1
+
+        if self._sampled:
+            self._sample_hashes.setdefault(intent, array("Q")).append(
+                text_hash(key, b"sample")
+            )
+            self._spill.writerow([text, intent])
+            return "pending"
+
+        return self._write(text, intent, key)
+
+    def _write(self, text, intent, key):
+        self.counts[intent] += 1
+        # Ayrım için ayrı tuzlu hash: dedup hash'inden bağımsız dağılım
+        if self._val is not None and text_hash(key, b"split") % 10_000 < self.val_ratio * 10_000:
+            self.val_counts[intent] += 1
+            self._val.writerow([text, intent])
+            return "val"
+
+        self._train.writerow([text, intent])
+        return "train"
+
+    def _limits(self):
+        """intent → seçilecek en büyük örnekleme hash'i (dahil)"""
+        sizes = {i: len(h) for i, h in self._sample_hashes.items()}
+        k = self.max_per_intent
+        if self.balance and sizes:
+            k = min(sizes.values()) if k is None else min(k, min(sizes.values()))
+
+        limits = {}
+        for intent, hashes in self._sample_hashes.items():
+            if k is None or len(hashes) <= k:
+                limits[intent] = None
+            elif k <= 0:
+                limits[intent] = -1
+            else:
+                limits[intent] = heapq.nsmallest(k, hashes)[-1]
+        return limits
+
+    def _flush_sampled(self):
+        self._spill_file.close()
+        limits = self._limits()
+        self._sample_hashes = {}
+
+        with open(self._spill_path, encoding="utf-8", newline="") as f:
+            for text, intent in csv.reader(f):
+                key = normalize(text)
+                limit = limits[intent]
+                if limit is not None and text_hash(key, b"sample") > limit:
+                    self.capped += 1
+                    continue
+                self._write(text, intent, key)
+        os.remove(self._spill_path)
+
+    def close(self):
+        if self._spill is not None:
+            self._spill = None
+            self._flush_sampled()
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    @property
+    def written(self):
+        return sum(self.counts.values())
+
+    def summary(self):
+        val = sum(self.val_counts.values())
+        lines = [
+            f"📊 Yazılan: {self.written} (train {self.written - val} | val {val})"
+            f" | tekrar: {self.duplicates} | etiket çakışması: {self.conflicts}"
+            f" | limit / denge: {self.capped}"
+        ]
+        if self.seen is not None:
+            nbytes = self.seen.nbytes + self.seen_text.nbytes
+            lines.append(f"🧮 Tekilleştirme belleği: {nbytes / 2**20:.1f} MB")
+        for intent, n in self.counts.most_common():
+            lines.append(f"   {intent:24s} {n:>9d} (val {self.val_counts[intent]})")
+        return "\n".join(lines)